@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import os
 import signal
 import sys
@@ -19,10 +20,14 @@ async def main() -> None:
     """Create and run the bot"""
 
     bot: TimeClockBot = TimeClockBot(intents=_intents)
-    await check_database(bot)
 
+    # the database and the extensions don't depend on each other, prepare both at once so the
+    # guild cache is warm before logging in instead of after the gateway is ready. If either
+    # fails the other is cancelled, the failure is raised in an ExceptionGroup
     try:
-        bot.load_extensions()
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(prepare_database(bot))
+            tg.create_task(bot.load_extensions())
     except Exception:
         await bot.close()
         raise
@@ -30,18 +35,29 @@ async def main() -> None:
     logger.info("Bot is starting...")
 
     if os.name != "nt":
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+
+        stop = asyncio.Event()
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
 
-        future = asyncio.ensure_future(bot.start(Client.token or ""), loop=loop)
-        loop.add_signal_handler(signal.SIGINT, lambda: future.cancel())
-        loop.add_signal_handler(signal.SIGTERM, lambda: future.cancel())
+        start_task = asyncio.create_task(bot.start(Client.token or ""))
+        stop_task = asyncio.create_task(stop.wait())
 
-        try:
-            await future
-        except asyncio.CancelledError:
+        done, _ = await asyncio.wait({start_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+
+        if stop_task in done:
             logger.warning("Kill command was sent to the bot. Closing bot and event loop")
             if not bot.is_closed():
                 await bot.close()
+
+            # the bot is already closed, this only cleans up whatever start() left pending
+            start_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await start_task
+        else:
+            stop_task.cancel()
+            start_task.result()
     else:
         await bot.start(Client.token or "")
 
@@ -57,6 +73,13 @@ async def check_database(bot: TimeClockBot):
         return
 
     logger.info("Database previously initialized at `timeclock/database/data.sqlite3`")
+    await database.create_indexes(bot.db_engine)
+
+
+async def prepare_database(bot: TimeClockBot) -> None:
+    """Check the database, then warm the bot's caches from it"""
+    await check_database(bot)
+    await bot.warm_caches()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import os
+import threading
+
+from timeclock import log
+
+logger = log.get_logger(__name__)
+
+_LOADED = False
+_LOCK = threading.Lock()
+
+
+def ensure_loaded() -> None:
+    """Load the .env file into `os.environ` exactly once per interpreter"""
+    global _LOADED
+
+    with _LOCK:
+        if _LOADED:
+            return
+        _LOADED = True
+
+        try:
+            from dotenv import dotenv_values
+        except ModuleNotFoundError:
+            return
+
+        os.environ.update({k: v for k, v in dotenv_values().items() if v is not None})
+        logger.info("Environment variables loaded from .env file")
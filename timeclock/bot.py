@@ -1,63 +1,280 @@
-import os
-from datetime import datetime
+import asyncio
+import importlib.util
+import time
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
 from sys import version as sys_version
-from typing import Sequence, overload
+from typing import Any, Awaitable, Callable, ClassVar, Hashable, Sequence, overload
 
 import disnake
 from disnake import __version__ as disnake_version
 from disnake.ext import commands
+from sqlalchemy import bindparam, event, insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from timeclock import __version__ as bot_version
 from timeclock import log
-from timeclock.constants import Database
+from timeclock.cache import GuildCache, MemberCache
+from timeclock.cache.members import load_recent_times
+from timeclock.constants import Cache, Database
 from timeclock.database.guild import Guild
 from timeclock.database.member import Member
 from timeclock.database.role import Role
+from timeclock.database.session import session_scope
 from timeclock.database.time import Time
 
 __all__ = ("TimeClockBot",)
 
 logger = log.get_logger(__name__)
 
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+_TS_FMT = "%m/%d/%Y - %H:%M:%S"
+
+# only the timestamp and user change between ready events, the versions are rendered once
+_BANNER_TEMPLATE = (
+    "----------------------------------------------------------------------\n"
+    "Bot started at: {ts}\n"
+    f"System Version: {sys_version}\n"
+    f"Disnake Version: {disnake_version}\n"
+    f"Bot Version: {bot_version}\n"
+    "Connected to Discord as {user} ({uid})\n"
+    "----------------------------------------------------------------------\n"
+)
+
+
+# every punch writes the same statements, they are built once and executed with `b_member_id`,
+# `b_guild_id` and `b_ts` parameters (insert/update reserve the column names)
+
+# new members are inserted on duty, existing members have their status flipped in place, either
+# way the returned status is the one after this punch
+_TOGGLE_DUTY = (
+    sqlite_insert(Member)
+    .values(id=bindparam("b_member_id"), guild_id=bindparam("b_guild_id"), on_duty=True)
+    .on_conflict_do_update(index_elements=[Member.id], set_={"on_duty": ~Member.on_duty})
+    .returning(Member.on_duty)
+)
+_CLOSE_PUNCH = (
+    update(Time)
+    .where(Time.member_id == bindparam("b_member_id"), Time.punch_out.is_(None))
+    .values(punch_out=bindparam("b_ts"))
+    .returning(Time.punch_in)
+)
+_OPEN_PUNCH = (
+    insert(Time)
+    .values(member_id=bindparam("b_member_id"), punch_in=bindparam("b_ts"))
+    .returning(Time.id)
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune every new SQLite connection for a single-process, write-light workload"""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+    # pysqlite only emits BEGIN ahead of DML, a SAVEPOINT outside of it opens a transaction of
+    # its own that RELEASE commits. Leave transactions to SQLAlchemy, see `_begin_transaction`
+    dbapi_connection.isolation_level = None
+
+
+def _begin_transaction(conn) -> None:
+    """Start every SQLAlchemy transaction on the connection with an explicit BEGIN"""
+    conn.exec_driver_sql("BEGIN")
+
+
+class _PunchBatcher:
+    """Collects the punches submitted within `delay` seconds of each other and writes them in
+    a single transaction, each punch within its own savepoint.
+
+    A batch holds one punch per `key`, later punches with the same key wait for the next batch
+    so each is written after the previous one has been applied. Once a batch is committed,
+    `apply` is called with each punch's arguments and written result in order, before any
+    submitter resumes, and every submitter's future resolves with what `apply` returned. A
+    punch that fails only rolls back its own savepoint, if the batch fails to commit none of its
+    punches are written or applied and every submitter gets the error."""
+
+    def __init__(
+        self,
+        session: async_sessionmaker[AsyncSession],
+        write: Callable[..., Awaitable[Any]],
+        apply: Callable[..., Any],
+        key: Callable[..., Hashable],
+        *,
+        delay: float = 0.01,
+        max_size: int = 50,
+    ) -> None:
+        self.session = session
+        self.write = write
+        self.apply = apply
+        self.key = key
+        self.delay = delay
+        self.max_size = max_size
+        self._queue: list[tuple[tuple, asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, *args) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((args, future))
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+        return await asyncio.shield(future)
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.sleep(self.delay)
+            while self._queue:
+                await self._write(self._take_batch())
+        finally:
+            self._task = None
+
+    def _take_batch(self) -> list[tuple[tuple, asyncio.Future]]:
+        batch, rest, keys = [], [], set()
+        for item in self._queue:
+            key = self.key(*item[0])
+            if len(batch) < self.max_size and key not in keys:
+                keys.add(key)
+                batch.append(item)
+            else:
+                rest.append(item)
+
+        self._queue = rest
+        return batch
+
+    async def _write(self, batch: list[tuple[tuple, asyncio.Future]]) -> None:
+        results: list[tuple[tuple, asyncio.Future, Any]] = []
+
+        # use a dedicated session, the submitters' scoped sessions may still be in use
+        try:
+            async with self.session() as session, session.begin():
+                for args, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            results.append((args, future, await self.write(session, *args)))
+                    except Exception as e:
+                        future.set_exception(e)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for args, future, result in results:
+            try:
+                applied = self.apply(*args, result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+
+            if not future.done():
+                future.set_result(applied)
+
 
 class TimeClockBot(commands.InteractionBot):
     """Base bot instance"""
 
+    _extension_cache: ClassVar[dict[float, list[str]]] = {}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self.db_engine = engine = create_async_engine(Database.sql_bind)
+        # aiosqlite defaults to NullPool, which opens and closes the database file for every
+        # session. Keep a few connections around instead, one per concurrent transaction.
+        self.db_engine = engine = create_async_engine(
+            Database.sql_bind,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=False,
+        )
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        event.listen(engine.sync_engine, "begin", _begin_transaction)
         self.db_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
             engine, expire_on_commit=False, class_=AsyncSession
         )
+        self.guild_cache = GuildCache(self.db_session)
+        self.member_cache = MemberCache(self.db_session, max_size=Cache.max_members)
+        self._punch_batcher = _PunchBatcher(
+            self.db_session,
+            self._write_punch,
+            self._apply_punch,
+            key=lambda guild_id, member_id, timestamp: member_id,
+        )
+        self._warmed = False
 
     @property
     def db(self) -> async_sessionmaker[AsyncSession]:
         return self.db_session
 
+    async def warm_caches(self) -> None:
+        """Load the configured guilds into the cache, only once per process"""
+        if not self._warmed:
+            await self.guild_cache.warm()
+            self._warmed = True
+
     async def on_ready(self) -> None:
+        await self.warm_caches()
+
         logger.info(
-            "----------------------------------------------------------------------\n"
-            f'Bot started at: {datetime.now().strftime("%m/%d/%Y - %H:%M:%S")}\n'
-            f"System Version: {sys_version}\n"
-            f"Disnake Version: {disnake_version}\n"
-            f"Bot Version: {bot_version}\n"
-            f"Connected to Discord as {self.user} ({self.user.id})\n"
-            "----------------------------------------------------------------------\n"
+            _BANNER_TEMPLATE.format(ts=time.strftime(_TS_FMT), user=self.user, uid=self.user.id)
         )
 
-    def load_extensions(self) -> None:
-        """Load all extensions available on 'cogs'"""
+    async def load_extensions(self) -> None:
+        """Load all extensions available on 'cogs'
 
-        for item in os.listdir("timeclock/cogs/"):
-            if "__" in item:
-                continue
+        Module lookup and bytecode compilation are done concurrently in worker threads,
+        the extensions themselves are then loaded on the event loop since each `setup`
+        modifies the bot's state."""
+        extensions = self._find_extensions()
+
+        await asyncio.gather(*(asyncio.to_thread(self._compile_extension, e) for e in extensions))
 
-            extension = f"timeclock.cogs.{item[:-3]}"
+        for extension in extensions:
             self.load_extension(extension)
-            logger.info(f"Extension loaded: {extension}")
+
+        logger.info(f"Extensions loaded: {', '.join(extensions)}")
+
+    @staticmethod
+    def _compile_extension(extension: str) -> None:
+        """Resolve the extension's module spec and compile (and cache) its bytecode"""
+        spec = importlib.util.find_spec(extension)
+        if spec is not None and spec.loader is not None:
+            spec.loader.get_code(extension)
+
+    @classmethod
+    def _find_extensions(cls) -> list[str]:
+        """Return the extension module names within 'cogs', cached by the directory's mtime"""
+        path = Path("timeclock/cogs")
+        mtime = path.stat().st_mtime
+
+        extensions = cls._extension_cache.get(mtime)
+        if extensions is None:
+            extensions = sorted(
+                f"timeclock.cogs.{item.stem}"
+                for item in path.iterdir()
+                if item.suffix == ".py" and not item.stem.startswith("_")
+            )
+            cls._extension_cache[mtime] = extensions
+
+        return extensions
+
+    def session_scope(
+        self, session: AsyncSession | None = None
+    ) -> AbstractAsyncContextManager[AsyncSession]:
+        """Shortcut for `database.session_scope` using the bot's session factory"""
+        return session_scope(self.db_session, session)
 
     async def ensure_guild(
         self,
@@ -67,41 +284,65 @@ class TimeClockBot(commands.InteractionBot):
         channel_id: int | None = None,
         embed: disnake.Embed | None = None,
         session: AsyncSession | None = None,
+        force: bool = False,
     ) -> Guild:
-        session = session or self.db()
-        async with session.begin_nested() if session.in_transaction() else session.begin() as trans:
-
-            results = await session.execute(select(Guild).where(Guild.id == guild_id))
-            guild = results.scalar_one_or_none()
-
-            if not guild:
-                guild = Guild(
-                    id=guild_id, message_id=message_id, channel_id=channel_id, embed=embed
-                )
-                session.add(guild)
-            else:
-                guild.message_id = message_id if message_id else guild.message_id
-                guild.channel_id = channel_id if channel_id else guild.channel_id
-                guild.embed = embed if embed else guild.embed
-
-            await trans.commit()
-            return guild
+        """Return the guild's config row, creating it or updating any of the passed values.
+
+        When nothing is being updated, the guild is read through the guild cache and the row is
+        only written if it doesn't exist yet. Pass `force=True` to always write (and re-cache)
+        the row."""
+        if not force and message_id is None and channel_id is None and embed is None:
+            if (cached := await self.guild_cache.get_guild(guild_id)) is not None:
+                return cached
+
+        async with self.session_scope(session) as session:
+            values = {
+                "id": guild_id,
+                "message_id": message_id,
+                "channel_id": channel_id,
+                "_embed": Guild.dump_embed(embed),
+            }
+            stmt = sqlite_insert(Guild).values(values)
+
+            # only overwrite the columns that were passed, updating `id` to itself keeps the
+            # statement an upsert (so RETURNING always yields the row) when nothing was passed
+            updates = {k: v for k, v in values.items() if v is not None}
+            stmt = stmt.on_conflict_do_update(index_elements=[Guild.id], set_=updates)
+
+            result = await session.execute(
+                stmt.returning(Guild)
+                .options(selectinload(Guild.roles))
+                .execution_options(populate_existing=True)
+            )
+            guild = result.scalar_one()
+
+        self.guild_cache._add_guild(guild)
+        return guild
+
+    async def remove_config_message(
+        self, guild_id: int, message_id: int, session: AsyncSession | None = None
+    ) -> Guild | None:
+        """Forget the guild's punch message and channel if `message_id` is still the configured
+        message, the configured embed is kept for the next time it's posted."""
+        async with self.session_scope(session) as session:
+            result = await session.execute(
+                update(Guild)
+                .where(Guild.id == guild_id, Guild.message_id == message_id)
+                .values(message_id=None, channel_id=None)
+                .returning(Guild)
+                .options(selectinload(Guild.roles))
+                .execution_options(populate_existing=True)
+            )
+            guild = result.scalar_one_or_none()
+
+        if guild is not None:
+            self.guild_cache._add_guild(guild)
+        return guild
 
     async def get_guild_roles(
         self, guild_id: int, *, is_mod: bool | None = None, can_punch: bool | None = None
     ) -> Sequence[Role]:
-        session = self.db()
-
-        stmt = select(Role).where(Role.guild_id == guild_id)
-
-        if is_mod is not None:
-            stmt = stmt.where(Role.is_mod == is_mod)
-        if can_punch is not None:
-            stmt = stmt.where(Role.can_punch == can_punch)
-
-        async with session.begin():
-            result = await session.execute(stmt)
-            return result.scalars().all()
+        return await self.guild_cache.get_roles(guild_id, is_mod=is_mod, can_punch=can_punch)
 
     async def add_role(
         self,
@@ -111,68 +352,119 @@ class TimeClockBot(commands.InteractionBot):
         can_punch: bool | None = None,
         is_mod: bool | None = None,
     ) -> Role:
-        session = self.db()
-
-        async with session.begin() as trans:
-            await self.ensure_guild(guild_id, session=session)
-
-            result = await session.execute(select(Role).where(Role.id == role_id))
-            role = result.scalar_one_or_none()
-
-            if not role:
-                role = Role(id=role_id, guild_id=guild_id, can_punch=can_punch, is_mod=is_mod)
-                session.add(role)
-
-            else:
-                role.can_punch = can_punch if can_punch is not None else role.can_punch
-                role.is_mod = is_mod if is_mod is not None else role.is_mod
-
-            await trans.commit()
-
-            return role
-
-    async def delete_role(self, role_id: int) -> None:
-        session = self.db()
-
-        async with session.begin() as trans:
-
-            result = await session.execute(select(Role).where(Role.id == role_id))
-            role = result.scalar_one_or_none()
+        """Configure the role with a single upsert, an existing role keeps any permission that
+        is passed as None. A new role defaults to a non-mod role that can punch."""
+        async with self.session_scope() as session:
+            # a cached guild is known to have its row already, the role's FK is satisfied
+            if self.guild_cache._get_guild(guild_id) is None:
+                await self.ensure_guild(guild_id)
+
+            updates = {"id": role_id}
+            if can_punch is not None:
+                updates["can_punch"] = can_punch
+            if is_mod is not None:
+                updates["is_mod"] = is_mod
+
+            stmt = sqlite_insert(Role).values(
+                id=role_id,
+                guild_id=guild_id,
+                can_punch=True if can_punch is None else can_punch,
+                is_mod=False if is_mod is None else is_mod,
+            )
+            result = await session.execute(
+                stmt.on_conflict_do_update(index_elements=[Role.id], set_=updates)
+                .returning(Role)
+                .execution_options(populate_existing=True)
+            )
+            role = result.scalar_one()
+
+        self.guild_cache.invalidate(guild_id)
+        return role
+
+    async def delete_role(self, role_id: int, guild_id: int | None = None) -> None:
+        # when the guild is known, roles that were never configured don't need a transaction
+        if guild_id is not None and await self.guild_cache.get_role(guild_id, role_id) is None:
+            return
+
+        async with self.session_scope() as session:
+            role = await session.get(Role, role_id)
 
             if not role:
                 return
 
             await session.delete(role)
-            await trans.commit()
 
-    async def ensure_member(self, guild_id: int, member_id: int, session: AsyncSession) -> Member:
-        result = await session.execute(select(Member).where(Member.id == member_id))
-        member = result.scalar_one_or_none()
-
-        if not member:
-            member = Member(id=member_id, guild_id=guild_id)
-            session.add(member)
-            await session.flush()
-            await session.refresh(member)
-
-        return member
+        self.guild_cache.invalidate(role.guild_id)
+
+    async def _write_punch(
+        self, session: AsyncSession, guild_id: int, member_id: int, timestamp: float
+    ) -> tuple[bool, int | None, float | None, Member | None]:
+        """Write one punch, returning the member's previous duty status, the new time row's ID
+        when clocking in, when the opened or closed punch started, and the member with their
+        times if they were not cached yet.
+
+        The punch is written with an upsert that also toggles the member's status, plus a single
+        insert/update on the time table, a cached member's past times are never loaded for this."""
+        params = {"b_member_id": member_id, "b_guild_id": guild_id, "b_ts": timestamp}
+        was_on_duty = not (await session.execute(_TOGGLE_DUTY, params)).scalar_one()
+
+        if was_on_duty:
+            result = await session.execute(_CLOSE_PUNCH, params)
+            time_id, punch_in = None, max(result.scalars(), default=None)
+        else:
+            result = await session.execute(_OPEN_PUNCH, params)
+            time_id, punch_in = result.scalar_one(), timestamp
+
+        member = None
+        if self.member_cache._get_member(member_id) is None:
+            # first punch since startup, load the member once within the same transaction
+            member = await session.get(
+                Member, member_id, options=[load_recent_times()], populate_existing=True
+            )
+
+        return was_on_duty, time_id, punch_in, member
+
+    def _apply_punch(
+        self,
+        guild_id: int,
+        member_id: int,
+        timestamp: float,
+        written: tuple[bool, int | None, float | None, Member | None],
+    ) -> tuple[Member | None, float | None]:
+        """Apply a committed punch to the member cache, returning the cached member (None if they
+        were evicted meanwhile) and when the opened or closed punch started"""
+        was_on_duty, time_id, punch_in, loaded = written
+
+        if loaded is not None:
+            self.member_cache._add_member(loaded)
+            loaded.last_punch_in = punch_in
+            return loaded, punch_in
+
+        member = self.member_cache._get_member(member_id)
+        if member is None:
+            return None, punch_in
+
+        member.on_duty = not was_on_duty
+        member.last_punch_in = punch_in
+        if was_on_duty:
+            if (latest := member.latest_time) is not None:
+                latest.punch_out = timestamp
+        else:
+            member.times.append(Time(id=time_id, member_id=member_id, punch_in=timestamp))
+
+        return member, punch_in
 
     async def add_punch(self, guild_id: int, member_id: int, timestamp) -> Member:
-        session = self.db()
+        """Toggle the member's duty status, opening or closing a punch at `timestamp`.
 
-        async with session.begin():
-            member = await self.ensure_member(guild_id, member_id, session=session)
-            times = member.times
+        Punches arriving at the same time are committed together in one transaction, a member's
+        punches are written one after the other."""
+        member, punch_in = await self._punch_batcher.submit(guild_id, member_id, timestamp)
 
-            if not times or not member.on_duty:
-                member.on_duty = True
-                member.times.append(Time(punch_in=timestamp))
-            else:
-                member.on_duty = False
-                member.times[-1].punch_out = timestamp
-
-            await session.flush()
-            await session.refresh(member)
+        if member is None:
+            # evicted while the punch was written, read back along with the committed punch
+            member = await self.member_cache.get_member(member_id)
+            member.last_punch_in = punch_in
 
         return member
 
@@ -185,16 +477,8 @@ class TimeClockBot(commands.InteractionBot):
     async def get_members(
         self, guild_id: int, *, member_id: int | None = None
     ) -> Sequence[Member] | Member | None:
-        session = self.db()
-
-        stmt = select(Member).where(Member.guild_id == guild_id)
         if member_id:
-            stmt = stmt.where(Member.id == member_id)
-
-        async with session.begin():
-            result = await session.execute(stmt)
-
-            if member_id:
-                return result.scalar_one_or_none()
+            member = await self.member_cache.get_member(member_id)
+            return member if member is not None and member.guild_id == guild_id else None
 
-            return result.scalars().all()
+        return await self.member_cache.get_members(guild_id)
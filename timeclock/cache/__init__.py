@@ -0,0 +1,4 @@
+from .guilds import GuildCache
+from .members import MemberCache
+
+__all__ = ("GuildCache", "MemberCache")
@@ -0,0 +1,217 @@
+from collections import OrderedDict
+from typing import Collection, Sequence
+
+from sqlalchemy import lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from timeclock.database.guild import Guild
+from timeclock.database.role import Role
+from timeclock.database.session import session_scope
+
+__all__ = ("GuildCache",)
+
+_GUILD_WITH_ROLES = select(Guild).options(selectinload(Guild.roles))
+
+
+class GuildCache:
+    """In-process cache of the guild configurations stored within the database
+
+    Guilds that were looked up but do not exist in the database are remembered in a bounded
+    negative cache, so repeat lookups for guilds that never configured the bot are answered
+    without a database round-trip."""
+
+    __slots__ = (
+        "session",
+        "_cache",
+        "_negative",
+        "_role_index",
+        "_mod_role_ids",
+        "_punch_role_ids",
+        "_filtered_roles",
+        "_role_lines",
+        "_message_ids",
+        "_warmed",
+    )
+
+    MAX_NEGATIVE = 512
+
+    def __init__(self, session: async_sessionmaker[AsyncSession]) -> None:
+        self.session = session
+        self._cache: dict[int, Guild] = {}
+        self._negative: OrderedDict[int, None] = OrderedDict()
+        self._role_index: dict[int, dict[int, Role]] = {}
+        self._mod_role_ids: dict[int, frozenset[int]] = {}
+        self._punch_role_ids: dict[int, frozenset[int]] = {}
+        self._filtered_roles: dict[tuple[int, bool | None, bool | None], tuple[Role, ...]] = {}
+        self._role_lines: dict[int, tuple[tuple[int, str], ...]] = {}
+        self._message_ids: dict[int, int] = {}
+        self._warmed = False
+
+    def _get_guild(self, guild_id: int) -> Guild | None:
+        return self._cache.get(guild_id)
+
+    def _add_guild(self, guild: Guild) -> None:
+        self._cache[guild.id] = guild
+        self._index_roles(guild)
+        self._negative.pop(guild.id, None)
+        self._drop_filtered_roles(guild.id)
+        self._track_message(guild)
+
+    def _index_roles(self, guild: Guild) -> None:
+        # the sets every permission check tests against are built once per change to the roles
+        roles = guild.roles
+        self._role_index[guild.id] = {role.id: role for role in roles}
+        self._mod_role_ids[guild.id] = frozenset(role.id for role in roles if role.is_mod)
+        self._punch_role_ids[guild.id] = frozenset(role.id for role in roles if role.can_punch)
+
+    def _track_message(self, guild: Guild) -> None:
+        if guild.message_id is None:
+            self._message_ids.pop(guild.id, None)
+        else:
+            self._message_ids[guild.id] = guild.message_id
+
+    def _drop_filtered_roles(self, guild_id: int) -> None:
+        for key in [key for key in self._filtered_roles if key[0] == guild_id]:
+            del self._filtered_roles[key]
+        self._role_lines.pop(guild_id, None)
+
+    @staticmethod
+    def _get_roles(
+        roles: Sequence[Role], is_mod: bool | None = None, can_punch: bool | None = None
+    ) -> list[Role]:
+        if is_mod is None and can_punch is None:
+            return list(roles)
+
+        return [
+            role
+            for role in roles
+            if (is_mod is None or role.is_mod == is_mod)
+            and (can_punch is None or role.can_punch == can_punch)
+        ]
+
+    def _add_guilds(self, guilds: Sequence[Guild]) -> None:
+        cache, negative = self._cache, self._negative
+        for guild in guilds:
+            cache[guild.id] = guild
+            self._index_roles(guild)
+            negative.pop(guild.id, None)
+            self._drop_filtered_roles(guild.id)
+            self._track_message(guild)
+
+    def _add_negative(self, guild_id: int) -> None:
+        negative = self._negative
+        negative[guild_id] = None
+        if len(negative) > self.MAX_NEGATIVE:
+            negative.popitem(last=False)
+
+    def invalidate(self, guild_id: int) -> None:
+        """Drop any cached state for the guild, the next lookup will read from the database"""
+        self._cache.pop(guild_id, None)
+        self._role_index.pop(guild_id, None)
+        self._mod_role_ids.pop(guild_id, None)
+        self._punch_role_ids.pop(guild_id, None)
+        self._negative.pop(guild_id, None)
+        self._drop_filtered_roles(guild_id)
+
+    async def get_guild(self, guild_id: int) -> Guild | None:
+        """Return the guild's configuration, or None if the guild has not been configured"""
+        if guild := self._get_guild(guild_id):
+            return guild
+
+        if guild_id in self._negative:
+            return None
+
+        async with session_scope(self.session) as session:
+            result = await session.execute(
+                lambda_stmt(lambda: _GUILD_WITH_ROLES.where(Guild.id == guild_id))
+            )
+            guild = result.scalar_one_or_none()
+
+        if guild is None:
+            self._add_negative(guild_id)
+        else:
+            self._add_guild(guild)
+
+        return guild
+
+    async def warm(self) -> None:
+        """Load every configured guild and its roles into the cache with a single query"""
+        async with session_scope(self.session) as session:
+            result = await session.execute(_GUILD_WITH_ROLES)
+            self._add_guilds(result.scalars().all())
+
+        self._warmed = True
+
+    def may_be_config_message(self, guild_id: int, message_ids: Collection[int]) -> bool:
+        """Return False if none of the messages can be the guild's configured punch message.
+
+        Configured message IDs are tracked from the warm-up and every guild stored since, they
+        outlive `invalidate`. Until the cache is warmed every message may be the one."""
+        if not self._warmed:
+            return True
+
+        message_id = self._message_ids.get(guild_id)
+        return message_id is not None and message_id in message_ids
+
+    async def get_roles(
+        self, guild_id: int, *, is_mod: bool | None = None, can_punch: bool | None = None
+    ) -> Sequence[Role]:
+        """Return the guild's configured roles, optionally filtered by their permissions.
+
+        Filtered results are kept until the guild's roles change, so permission checks that
+        run on every interaction don't rebuild the same list each time."""
+        key = (guild_id, is_mod, can_punch)
+        if (roles := self._filtered_roles.get(key)) is not None and guild_id in self._cache:
+            return roles
+
+        guild = await self.get_guild(guild_id)
+        if guild is None:
+            return ()
+
+        roles = self._filtered_roles[key] = tuple(self._get_roles(guild.roles, is_mod, can_punch))
+        return roles
+
+    async def get_mod_role_ids(self, guild_id: int) -> frozenset[int]:
+        """Return the IDs of the guild's mod roles, built whenever the guild is cached"""
+        if (role_ids := self._mod_role_ids.get(guild_id)) is not None:
+            return role_ids
+
+        if await self.get_guild(guild_id) is None:
+            return frozenset()
+
+        return self._mod_role_ids[guild_id]
+
+    async def get_punch_role_ids(self, guild_id: int) -> frozenset[int]:
+        """Return the IDs of the guild's roles allowed to punch, built whenever the guild is
+        cached"""
+        if (role_ids := self._punch_role_ids.get(guild_id)) is not None:
+            return role_ids
+
+        if await self.get_guild(guild_id) is None:
+            return frozenset()
+
+        return self._punch_role_ids[guild_id]
+
+    async def get_role_lines(self, guild_id: int) -> tuple[tuple[int, str], ...]:
+        """Return `(role_id, line)` pairs describing each of the guild's configured roles.
+
+        Lines are rendered once per change to the guild's roles and mention the role by ID,
+        so they don't need resolving against the Discord guild."""
+        if (lines := self._role_lines.get(guild_id)) is not None and guild_id in self._cache:
+            return lines
+
+        roles = await self.get_roles(guild_id)
+        lines = self._role_lines[guild_id] = tuple(
+            (role.id, f"<@&{role.id}> | Is Mod: {role.is_mod} | Can Punch: {role.can_punch}")
+            for role in roles
+        )
+        return lines
+
+    async def get_role(self, guild_id: int, role_id: int) -> Role | None:
+        """Return the guild's configured role with the given ID, if there is one"""
+        if await self.get_guild(guild_id) is None:
+            return None
+
+        return self._role_index[guild_id].get(role_id)
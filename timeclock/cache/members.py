@@ -0,0 +1,173 @@
+import asyncio
+from collections import OrderedDict, defaultdict
+from typing import Sequence
+
+from sqlalchemy import Select, or_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+from sqlalchemy.orm import Load, raiseload, selectinload
+
+from timeclock.constants import Cache
+from timeclock.database.member import Member, history_cutoff
+from timeclock.database.session import session_scope
+from timeclock.database.time import Time
+
+__all__ = ("MemberCache", "load_recent_times")
+
+
+def load_recent_times(days: int = Cache.history_days) -> Load:
+    """Return the loader option for a member's punches from the last `days` days, along with
+    a punch that is still open however long ago it was opened.
+
+    The cutoff is a plain value rather than part of a `lambda_stmt`, whose cached statement
+    would keep the first cutoff it was built with."""
+    cutoff = history_cutoff(days)
+    return selectinload(Member.times.and_(or_(Time.punch_in >= cutoff, Time.punch_out.is_(None))))
+
+
+def _member_with_times() -> Select:
+    # cached members outlive their session, any relationship that isn't eagerly loaded should
+    # fail loudly rather than lazy load (or raise DetachedInstanceError) later
+    return select(Member).options(load_recent_times(), raiseload("*"))
+
+
+class _MemberLoader:
+    """Coalesces the single member lookups made within one event loop iteration into one
+    `WHERE member.id IN (...)` query, fanning the results back out to each caller"""
+
+    def __init__(
+        self, session: async_sessionmaker[AsyncSession], semaphore: asyncio.Semaphore
+    ) -> None:
+        self.session = session
+        self._semaphore = semaphore
+        self._pending: dict[int, asyncio.Future[Member | None]] = {}
+        self._scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, member_id: int) -> asyncio.Future[Member | None]:
+        loop = asyncio.get_running_loop()
+
+        future = self._pending.get(member_id)
+        if future is None:
+            future = self._pending[member_id] = loop.create_future()
+
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+
+        return future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+
+        task = asyncio.create_task(self._flush(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, pending: dict[int, asyncio.Future[Member | None]]) -> None:
+        # use a dedicated session, the callers' scoped sessions may still be in use
+        try:
+            async with self._semaphore, self.session() as session, session.begin():
+                result = await session.execute(_member_with_times().where(Member.id.in_(pending)))
+                members = {member.id: member for member in result.scalars()}
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for member_id, future in pending.items():
+            if not future.done():
+                future.set_result(members.get(member_id))
+
+
+class MemberCache:
+    """In-process cache of the members that have punched in, along with their times
+
+    Punches are written through the cache, so reads after the first load are served from
+    memory. Rows loaded from the database never replace a member that is already cached.
+
+    At most `max_size` members are kept, the least recently used member is evicted first and
+    their guild is no longer considered fully loaded.
+
+    No more than `max_concurrency` database reads or writes are made at once, a burst of cache
+    misses waits for a free slot rather than exhausting the engine's connection pool (which is
+    shared with punches and guild lookups)."""
+
+    def __init__(
+        self,
+        session: async_sessionmaker[AsyncSession],
+        max_size: int = 10_000,
+        max_concurrency: int = 20,
+    ) -> None:
+        self.session = session
+        self.max_size = max_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache: OrderedDict[int, Member] = OrderedDict()
+        self._by_guild: defaultdict[int, set[int]] = defaultdict(set)
+        self._loaded_guilds: set[int] = set()
+        self._loader = _MemberLoader(session, self._semaphore)
+
+    def _get_member(self, member_id: int) -> Member | None:
+        member = self._cache.get(member_id)
+        if member is not None:
+            self._cache.move_to_end(member_id)
+        return member
+
+    def _get_members(self, guild_id: int) -> list[Member]:
+        # the index is a set, sorted so members come back in the same order as from the database
+        cache = self._cache
+        return [cache[member_id] for member_id in sorted(self._by_guild.get(guild_id, ()))]
+
+    def _add_member(self, member: Member) -> None:
+        if (old := self._cache.get(member.id)) is not None and old.guild_id != member.guild_id:
+            self._by_guild[old.guild_id].discard(member.id)
+
+        self._cache[member.id] = member
+        self._cache.move_to_end(member.id)
+        self._by_guild[member.guild_id].add(member.id)
+        self._evict()
+
+    def _add_members(self, members: Sequence[Member]) -> None:
+        cache, by_guild = self._cache, self._by_guild
+        for member in members:
+            if member.id not in cache:
+                cache[member.id] = member
+                by_guild[member.guild_id].add(member.id)
+        self._evict()
+
+    def _evict(self) -> None:
+        cache, by_guild = self._cache, self._by_guild
+        while len(cache) > self.max_size:
+            member_id, member = cache.popitem(last=False)
+            by_guild[member.guild_id].discard(member_id)
+            self._loaded_guilds.discard(member.guild_id)
+
+    async def get_member(self, member_id: int) -> Member | None:
+        """Return the member, or None if they have never punched in."""
+        if (member := self._get_member(member_id)) is not None:
+            return member
+
+        member = await asyncio.shield(self._loader.load(member_id))
+        if member is None:
+            return None
+
+        # a punch may have cached a newer copy while this one was loading
+        self._add_members([member])
+        return self._cache[member.id]
+
+    async def get_members(self, guild_id: int) -> list[Member]:
+        """Return every member of the guild that has punched in."""
+        if guild_id in self._loaded_guilds:
+            return self._get_members(guild_id)
+
+        stmt = _member_with_times().where(Member.guild_id == guild_id).order_by(Member.id)
+        async with self._semaphore, session_scope(self.session) as session:
+            members = (await session.execute(stmt)).scalars().all()
+
+        # marked first, evicting any of these members while caching them unmarks the guild
+        self._loaded_guilds.add(guild_id)
+        self._add_members(members)
+        cache = self._cache
+        return [cache.get(member.id, member) for member in members]
@@ -1,21 +1,51 @@
 import json
+import time
 from typing import List, Optional
 
 import disnake
 from disnake.ext import commands
-from thefuzz import process
 
 from timeclock import components, constants, log
 from timeclock.bot import TimeClockBot
 
+try:
+    from rapidfuzz import fuzz, process, utils
+except ModuleNotFoundError:
+    from thefuzz import process
+
+    _EXTRACT_KWARGS = {}
+else:
+    # match thefuzz's defaults, rapidfuzz doesn't preprocess (lowercase, strip) by default
+    _EXTRACT_KWARGS = {"scorer": fuzz.WRatio, "processor": utils.default_process}
+
 logger = log.get_logger(__name__)
 
+ROLE_CHOICES_TTL = 30
+
 
 class Admin(commands.Cog):
     """Add admin commands to the bot"""
 
     def __init__(self, bot: TimeClockBot) -> None:
         self.bot = bot
+        self._role_choices: dict[int, tuple[float, tuple[int, ...], dict[str, str]]] = {}
+
+    def get_role_choices(self, guild: disnake.Guild, role_ids: tuple[int, ...]) -> dict[str, str]:
+        """Return the `{role_id: role_name}` autocomplete choices for the configured roles.
+
+        Choices are reused between keystrokes until the configured roles change or they are
+        older than `ROLE_CHOICES_TTL` seconds, so renamed roles are eventually picked up."""
+        cached = self._role_choices.get(guild.id)
+        if cached is not None and cached[1] == role_ids and cached[0] > time.monotonic():
+            return cached[2]
+
+        choices = {
+            str(role.id): role.name
+            for role_id in role_ids
+            if (role := guild.get_role(role_id)) is not None
+        }
+        self._role_choices[guild.id] = (time.monotonic() + ROLE_CHOICES_TTL, role_ids, choices)
+        return choices
 
     def check_channel_permissions(self, inter: disnake.GuildCommandInteraction) -> bool:
         """Check that the bot is able to view the channel, send messages, and read history
@@ -28,12 +58,11 @@ class Admin(commands.Cog):
     async def cog_slash_command_check(self, inter: disnake.GuildCommandInteraction) -> bool:
         """Performs a check for every command within this cog.  If returns True,
         command is invoked, else command.CheckFailed is raise"""
-        roles = inter.author.roles
-        mod_roles = await self.bot.get_guild_roles(inter.guild.id, is_mod=True)
+        if inter.author.guild_permissions.administrator:
+            return True
 
-        return (
-            any(role in mod_roles for role in roles) or inter.author.guild_permissions.administrator
-        )
+        mod_ids = await self.bot.guild_cache.get_mod_role_ids(inter.guild.id)
+        return not mod_ids.isdisjoint(role.id for role in inter.author.roles)
 
     async def cog_slash_command_error(
         self, inter: disnake.GuildCommandInteraction, error: Exception
@@ -86,9 +115,9 @@ class Admin(commands.Cog):
             )
 
         guild = await self.bot.ensure_guild(inter.guild.id)
-        embed = guild.embed if guild and guild.embed else constants.default_embed()
+        embed = guild.embed or constants.default_embed()
 
-        if guild and guild.channel_id:
+        if guild.channel_id:
             channel = inter.guild.get_channel(guild.channel_id)
             message = channel.get_partial_message(guild.message_id)
         else:
@@ -118,12 +147,9 @@ class Admin(commands.Cog):
         """View roles and permissions you have configured to use with the bot"""
         await inter.response.defer()
 
-        roles = await self.bot.get_guild_roles(inter.guild.id)
-        if roles:
-            description = "\n".join(
-                f"{inter.guild.get_role(role.id).mention} | Is Mod: {role.is_mod} | Can Punch: {role.can_punch}"
-                for role in roles
-            )
+        lines = await self.bot.guild_cache.get_role_lines(inter.guild.id)
+        if lines:
+            description = "\n".join(line for _, line in lines)
         else:
             description = "No roles have been configured yet."
 
@@ -193,7 +219,7 @@ class Admin(commands.Cog):
             return await inter.response.send_message(f"`{role}` is not valid", ephemeral=True)
 
         try:
-            await self.bot.delete_role(role)
+            await self.bot.delete_role(role, inter.guild.id)
         except ValueError as e:
             await inter.response.send_message(e, ephemeral=True)
             return
@@ -216,9 +242,9 @@ class Admin(commands.Cog):
         if not roles:
             return ["No roles have been configured"]
 
-        roles = [inter.guild.get_role(r.id) for r in roles]
+        choices = self.get_role_choices(inter.guild, tuple(r.id for r in roles))
 
-        response = process.extract(string, {str(r.id): r.name for r in roles}, limit=25)
+        response = process.extract(string, choices, limit=25, **_EXTRACT_KWARGS)
         return {r[0]: r[-1] for r in response}
 
 
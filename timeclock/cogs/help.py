@@ -37,9 +37,14 @@ Message and User context commands do not inherently have a description, so these
 """
 from __future__ import annotations
 
-import copy
+import asyncio
+import dataclasses
+import functools
+import time
+import weakref
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Union
+from itertools import chain
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 
 import disnake
 from disnake.ext import commands
@@ -50,9 +55,67 @@ DESCRIPTION = None
 MAX_EMBED_FIELD_CHAR_COUNT = 700
 MAX_EMBED_FIELDS = 3
 EMBED_BREAK = "\n\n"
+COMMAND_CACHE_TTL = 300
+SKIPPED_COMMANDS = frozenset({"help"})
 
+# checks are created once per decorated command, so their parsed closures are kept for as long
+# as the check itself is alive
+_PARSED_CHECKS: weakref.WeakKeyDictionary[Callable, Tuple[Optional[str], tuple]] = (
+    weakref.WeakKeyDictionary()
+)
 
-@dataclass
+
+@functools.lru_cache(maxsize=1024)
+def _get_argument(name: str, required: bool, description: str) -> Argument:
+    """Return a shared `Argument`, identical options of global commands resolve to a single
+    instance across guilds"""
+    return Argument(name=name, required=required, description=description)
+
+
+def _classify_check(check: Callable) -> Tuple[Optional[str], tuple]:
+    """
+    Classify a command check by the decorator that created it.
+
+    Parameters
+    ----------
+    check : `Callable`
+        The check predicate, as found in a command's `checks`.
+
+    Returns
+    -------
+    `Tuple[Optional[str], tuple]`
+        `("role", role names or IDs)` for role checks, `("permission", permission names)` for
+        permission checks, or `(None, ())` for any other check.
+    """
+
+    try:
+        return _PARSED_CHECKS[check]
+    except (KeyError, TypeError):
+        pass
+
+    parsed = (None, ())
+    name = check.__qualname__.split(".")[0]
+    if "bot" not in name and check.__closure__:
+        contents = check.__closure__[0].cell_contents
+
+        if name in ("has_role", "has_any_role"):
+            parsed = ("role", contents if isinstance(contents, tuple) else (contents,))
+
+        elif name in ("has_permissions", "has_guild_permissions"):
+            parsed = (
+                "permission",
+                tuple(p.replace("_", " ").title() for p, v in contents.items() if v),
+            )
+
+    try:
+        _PARSED_CHECKS[check] = parsed
+    except TypeError:
+        pass
+
+    return parsed
+
+
+@dataclass(frozen=True, slots=True)
 class Argument:
     """
     Represents a slash command argument.
@@ -72,7 +135,7 @@ class Argument:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     """
     Represents a base command for the bot's API.
@@ -105,7 +168,7 @@ class Command:
         return f"**{self.name}**"
 
 
-@dataclass
+@dataclass(slots=True)
 class SlashCommand(Command):
     """
     Represents a slash command.
@@ -120,7 +183,7 @@ class SlashCommand(Command):
     type: str = "Slash Command"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserCommand(Command):
     """
     Represents a user context command.
@@ -129,7 +192,7 @@ class UserCommand(Command):
     type: str = "User Command"
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageCommand(Command):
     """
     Represents a message context command.
@@ -138,6 +201,44 @@ class MessageCommand(Command):
     type: str = "Message Command"
 
 
+@dataclass(slots=True)
+class WalkedCommands:
+    """
+    A guild's walked application commands, cached by the help cog.
+
+    Attributes
+    ----------
+    walked_at : float
+        The `time.monotonic()` time the commands were walked at.
+    commands : List[Union[SlashCommand, MessageCommand, UserCommand]]
+        The walked commands.
+    by_name : dict[str, Union[SlashCommand, MessageCommand, UserCommand]]
+        The walked commands keyed by their name, the first command wins for duplicate names.
+    autocomplete_index : List[Tuple[str, str]]
+        `(lowercase name, name)` pairs of the walked commands, in order.
+    """
+
+    walked_at: float
+    commands: List[Union[SlashCommand, MessageCommand, UserCommand]]
+    by_name: dict[str, Union[SlashCommand, MessageCommand, UserCommand]]
+    autocomplete_index: List[Tuple[str, str]]
+
+    @classmethod
+    def from_commands(
+        cls, walked_at: float, commands: List[Union[SlashCommand, MessageCommand, UserCommand]]
+    ) -> WalkedCommands:
+        by_name = {}
+        for command in commands:
+            by_name.setdefault(command.name, command)
+
+        return cls(
+            walked_at=walked_at,
+            commands=commands,
+            by_name=by_name,
+            autocomplete_index=[(command.name.lower(), command.name) for command in commands],
+        )
+
+
 class Help(commands.Cog):
     """
     A cog class that adds a help command to provide information about all bot slash commands, message commands, user commands,
@@ -151,6 +252,47 @@ class Help(commands.Cog):
 
     def __init__(self, bot: commands.InteractionBot) -> None:
         self.bot = bot
+        self._walk_cache: dict[int, WalkedCommands] = {}
+        self._bot_identity: Optional[Tuple[str, str]] = None
+        self._global_commands: Optional[
+            List[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]]
+        ] = None
+
+    @commands.Cog.listener("on_ready")
+    async def clear_walk_cache(self) -> None:
+        """Application commands are (re)synced on connect, drop every guild's walked commands
+        and the processed global commands, along with the bot's cached name and avatar"""
+        self._walk_cache.clear()
+        self._bot_identity = None
+        self._global_commands = None
+
+    def _get_bot_identity(self) -> Tuple[str, str]:
+        """
+        Return the bot's display name and avatar URL for help embeds, resolved once per connect.
+
+        Returns
+        -------
+        `Tuple[str, str]`
+            The bot's display name and its avatar URL, or its default avatar URL if it has none.
+
+        Notes
+        -----
+        This is an internal method and should not be called directly.
+        """
+
+        if self._bot_identity is None:
+            user = self.bot.user
+            avatar_url = user.avatar.url if user.avatar else user.default_avatar.url
+            self._bot_identity = (user.display_name, avatar_url)
+
+        return self._bot_identity
+
+    @commands.Cog.listener("on_application_command_permissions_update")
+    async def invalidate_walk_cache(
+        self, permissions: disnake.GuildApplicationCommandPermissions
+    ) -> None:
+        """Drop the guild's walked commands when its command permissions are changed"""
+        self._walk_cache.pop(permissions.guild_id, None)
 
     @commands.slash_command(name="help")
     async def help_command(
@@ -167,17 +309,17 @@ class Help(commands.Cog):
             The name of a specific command to get information about. Defaults to None.
         """
 
-        all_commands = self._walk_app_commands(inter.guild)
+        walked = await self._get_app_commands(inter.guild)
 
         if command:
-            specific_command = self._get_command_named(command, all_commands)
+            specific_command = self._get_command_named(command, walked.by_name)
             embed = self._create_command_detail_embed(specific_command)
             await inter.response.send_message(
                 embed=embed, components=components.TrashButton(inter.author.id)
             )
             return
 
-        embeds = self._create_help_embed(all_commands)
+        embeds = self._create_help_embed(walked.commands)
 
         if len(embeds) == 1:
             await inter.response.send_message(
@@ -186,21 +328,21 @@ class Help(commands.Cog):
             return
 
         await inter.response.send_message(
-            embed=embeds[0], view=components.Pagination(embeds, inter.author)
+            embed=embeds[0], view=components.Pagination(embeds, inter)
         )
 
     def _get_command_named(
-        self, name: str, commands: List[Union[SlashCommand, MessageCommand, UserCommand]]
+        self, name: str, commands: dict[str, Union[SlashCommand, MessageCommand, UserCommand]]
     ) -> Union[SlashCommand, UserCommand, MessageCommand]:
         """
-        Retrieve a single command from the provided list of commands by its name.
+        Retrieve a single command from the provided commands by its name.
 
         Parameters
         ----------
         name : `str`
             The name of the command to retrieve.
-        commands : `List[Union[SlashCommand, MessageCommand, UserCommand]]`
-            A list of commands to search through.
+        commands : `dict[str, Union[SlashCommand, MessageCommand, UserCommand]]`
+            The commands to search through, keyed by their name.
 
         Returns
         -------
@@ -208,32 +350,30 @@ class Help(commands.Cog):
             The matched command object or None if not found.
         """
 
-        return next((command for command in commands if name == command.name), None)
+        return commands.get(name)
 
     def _parse_checks(
         self,
         command: Union[disnake.APISlashCommand, disnake.APIMessageCommand, disnake.APIUserCommand],
-        guild: disnake.Guild,
-    ) -> Tuple[List[str], List[disnake.Role]]:
+    ) -> Tuple[List[str], tuple]:
         """
         Parse the checks associated with a command and extract registered permissions and roles
         required to run the command.
 
-        It supports slash commands, message commands, and user commands.
+        It supports slash commands, message commands, and user commands. Roles are returned as
+        they were passed to the check, so the result doesn't depend on any guild.
 
         Parameters
         ----------
         command : `Union[disnake.APISlashCommand, disnake.APIMessageCommand, disnake.APIUserCommand]`
             The command object to parse checks from.
-        guild : `disnake.Guild`
-            The guild in which the help command was called.
 
         Returns
         -------
-        `Tuple[List[str], List[disnake.Role]]`
-            A tuple containing a list of permission names and a list of roles.
+        `Tuple[List[str], tuple]`
+            A tuple containing a list of permission names and a tuple of role names or IDs.
             The permission names list contains the names of required permissions,
-            and the roles list contains the roles required to execute the command.
+            and the role tuple contains the roles required to execute the command.
 
         Notes
         -----
@@ -255,46 +395,71 @@ class Help(commands.Cog):
             checks = _command(command.name).checks
 
             for check in checks:
-                name = check.__qualname__.split(".")[0]
-                if "bot" in name:
-                    continue
-
-                if not check.__closure__:
-                    continue
-
-                closure = check.__closure__[0]
-                args = (
-                    closure.cell_contents
-                    if len(closure.cell_contents) > 1
-                    else (closure.cell_contents,)
-                )
+                kind, args = _classify_check(check)
 
-                if name in ("has_role", "has_any_role"):
-                    for arg in args:
-                        role = disnake.utils.get(guild.roles, name=arg) or guild.get_role(arg)
-                        if role:
-                            role_checks.append(role)
+                if kind == "role":
+                    role_checks.extend(args)
 
-                elif name in ("has_permissions", "has_guild_permissions"):
-                    perm_checks.extend(
-                        [p.replace("_", " ").title() for p, v in closure.cell_contents.items() if v]
-                    )
+                elif kind == "permission":
+                    perm_checks.extend(args)
+
+        return perm_checks, tuple(role_checks)
+
+    async def _get_app_commands(self, guild: disnake.Guild) -> WalkedCommands:
+        """
+        Return the guild's walked application commands, walking them only if they are not cached
+        or were cached more than `COMMAND_CACHE_TTL` seconds ago.
+
+        Processing the commands' options and checks is done in a worker thread, only reading
+        the bot's command caches and resolving roles is done on the event loop.
+
+        Parameters
+        ----------
+        guild : `disnake.Guild`
+            The guild for which to retrieve application commands.
+
+        Returns
+        -------
+        `WalkedCommands`
+            The commands as returned by `_walk_app_commands`, along with their lookups.
+
+        Notes
+        -----
+        This is an internal method and should not be called directly.
+        """
+
+        cached = self._walk_cache.get(guild.id)
+        now = time.monotonic()
+        if cached is not None and now - cached.walked_at < COMMAND_CACHE_TTL:
+            return cached
+
+        global_commands = await self._get_global_commands()
+        guild_commands = await asyncio.to_thread(
+            self._build_commands, list(self.bot.get_guild_application_commands(guild.id))
+        )
 
-        return perm_checks, role_checks
+        walked = self._walk_cache[guild.id] = WalkedCommands.from_commands(
+            now, self._walk_app_commands(guild, chain(global_commands, guild_commands))
+        )
+        return walked
 
     def _walk_app_commands(
-        self, guild: disnake.Guild
+        self,
+        guild: disnake.Guild,
+        commands: Iterable[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]],
     ) -> List[Union[SlashCommand, MessageCommand, UserCommand]]:
         """
         Retrieve all application commands (slash, message, and user context) for the bot in the specified guild.
 
-        This function combines both global and guild-specific commands, and processes each command type
-        to create a list of SlashCommand, MessageCommand, and UserCommand instances.
+        This function combines both global and guild-specific commands, as processed by `_build_commands`,
+        and resolves their role checks against the guild's roles.
 
         Parameters
         ----------
         guild : `disnake.Guild`
             The guild for which to retrieve application commands.
+        commands : `Iterable[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]]`
+            The guild's global and guild commands as returned by `_build_commands`.
 
         Returns
         -------
@@ -307,65 +472,138 @@ class Help(commands.Cog):
         This is an internal method and should not be called directly.
         """
 
-        all_commands = (
-            self.bot.global_application_commands + self.bot.get_guild_application_commands(guild.id)
-        )
+        # reversed so the first role with a given name wins, like `disnake.utils.get`
+        role_names = {role.name: role for role in reversed(guild.roles)}
+
+        def _resolve_roles(role_args: tuple) -> List[disnake.Role]:
+            roles = (role_names.get(arg) or guild.get_role(arg) for arg in role_args)
+            return [role for role in roles if role]
+
+        # only commands with role checks differ between guilds, the rest are shared as is
+        return [
+            (
+                dataclasses.replace(command, role_checks=_resolve_roles(role_args))
+                if role_args
+                else command
+            )
+            for command, role_args in commands
+        ]
+
+    async def _get_global_commands(
+        self,
+    ) -> List[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]]:
+        """
+        Return the bot's processed global commands, these are the same for every guild and are
+        only processed again after the bot reconnects.
+
+        Returns
+        -------
+        `List[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]]`
+            The commands as returned by `_build_commands`.
+
+        Notes
+        -----
+        This is an internal method and should not be called directly.
+        """
+
+        if self._global_commands is None:
+            self._global_commands = await asyncio.to_thread(
+                self._build_commands, list(self.bot.global_application_commands)
+            )
+
+        return self._global_commands
+
+    def _build_commands(
+        self,
+        commands: Iterable[
+            Union[disnake.APISlashCommand, disnake.APIMessageCommand, disnake.APIUserCommand]
+        ],
+    ) -> List[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]]:
+        """
+        Process application commands into SlashCommand, MessageCommand, and UserCommand instances.
+
+        Parameters
+        ----------
+        commands : `Iterable[Union[disnake.APISlashCommand, disnake.APIMessageCommand, disnake.APIUserCommand]]`
+            The application commands to process.
+
+        Returns
+        -------
+        `List[Tuple[Union[SlashCommand, MessageCommand, UserCommand], tuple]]`
+            Each processed command, without any role checks, and the role names or IDs of its
+            role checks.
+
+        Notes
+        -----
+        This is an internal method and should not be called directly.
+        """
 
-        def _handle_slash_command(command: disnake.APISlashCommand) -> List[SlashCommand]:
+        def _handle_slash_command(
+            command: disnake.APISlashCommand,
+        ) -> List[Tuple[SlashCommand, tuple]]:
             args = self._get_command_args(command)
-            checks = self._parse_checks(command, guild)
-            sub_commands = self._get_sub_commands(command, checks)
+            perm_checks, role_args = self._parse_checks(command)
+            sub_commands = self._get_sub_commands(command, (perm_checks, []))
 
-            return sub_commands or [
-                SlashCommand(
-                    id=command.id,
-                    name=command.name,
-                    description=command.description,
-                    args=args,
-                    permission_checks=checks[0],
-                    role_checks=checks[1],
-                )
+            return [
+                (sub_command, role_args)
+                for sub_command in sub_commands
+                or [
+                    SlashCommand(
+                        id=command.id,
+                        name=command.name,
+                        description=command.description,
+                        args=args,
+                        permission_checks=perm_checks,
+                    )
+                ]
             ]
 
-        def _handle_message_command(command: disnake.APIMessageCommand) -> MessageCommand:
+        def _handle_message_command(
+            command: disnake.APIMessageCommand,
+        ) -> Tuple[MessageCommand, tuple]:
             invokable_command = self.bot.get_message_command(command.name)
-            checks = self._parse_checks(command, guild)
+            perm_checks, role_args = self._parse_checks(command)
             description = invokable_command.extras.get("desc")
 
-            return MessageCommand(
-                id=command.id,
-                name=command.name,
-                description=description,
-                permission_checks=checks[0],
-                role_checks=checks[1],
+            return (
+                MessageCommand(
+                    id=command.id,
+                    name=command.name,
+                    description=description,
+                    permission_checks=perm_checks,
+                ),
+                role_args,
             )
 
-        def _handle_user_command(command: disnake.APIUserCommand) -> UserCommand:
+        def _handle_user_command(command: disnake.APIUserCommand) -> Tuple[UserCommand, tuple]:
             invokable_command = self.bot.get_user_command(command.name)
-            checks = self._parse_checks(command, guild)
+            perm_checks, role_args = self._parse_checks(command)
             description = invokable_command.extras.get("desc")
 
-            return UserCommand(
-                id=command.id,
-                name=command.name,
-                description=description,
-                permission_checks=checks[0],
-                role_checks=checks[1],
+            return (
+                UserCommand(
+                    id=command.id,
+                    name=command.name,
+                    description=description,
+                    permission_checks=perm_checks,
+                ),
+                role_args,
             )
 
-        _commands = []
-        for command in all_commands:
-            if command.name == "help":
-                continue
-
-            if command.type == disnake.ApplicationCommandType.chat_input:
-                _commands.extend(_handle_slash_command(command))
-            elif command.type == disnake.ApplicationCommandType.message:
-                _commands.append(_handle_message_command(command))
-            else:
-                _commands.append(_handle_user_command(command))
+        handlers = {
+            disnake.ApplicationCommandType.chat_input: _handle_slash_command,
+            disnake.ApplicationCommandType.message: lambda c: [_handle_message_command(c)],
+            disnake.ApplicationCommandType.user: lambda c: [_handle_user_command(c)],
+        }
+        handle_other = handlers[disnake.ApplicationCommandType.user]
 
-        return _commands
+        return [
+            _command
+            for command in commands
+            if command.name not in SKIPPED_COMMANDS
+            for _command in handlers.get(command.type, handle_other)(command)
+        ]
 
     def _get_sub_commands(
         self,
@@ -436,11 +674,7 @@ class Help(commands.Cog):
                 disnake.OptionType.sub_command,
                 disnake.OptionType.sub_command_group,
             ):
-                args.append(
-                    Argument(
-                        name=option.name, description=option.description, required=option.required
-                    )
-                )
+                args.append(_get_argument(option.name, option.required, option.description))
 
         return args
 
@@ -487,24 +721,23 @@ class Help(commands.Cog):
         This is an internal method and should not be called directly.
         """
 
-        embed = disnake.Embed(
-            title=f"{command.type} Details",
-            description=f"{command.mention}\n*{command.description}*\n\n",
-        )
-        embed.set_thumbnail(url=self.bot.user.avatar.url if self.bot.user.avatar else None)
-
-        if isinstance(command, SlashCommand):
-            embed.set_footer(text="[ required arguments ] | ( optional arguments )")
+        description = [f"{command.mention}\n*{command.description}*\n\n"]
 
         if command.permission_checks:
             permissions = ", ".join(
                 p.replace("_", " ").title() for p in command.permission_checks if p
             )
-            embed.description += f"**Required Permissions:**\n{permissions}\n"
+            description.append(f"**Required Permissions:**\n{permissions}\n")
 
         if command.role_checks:
             roles = ", ".join(r.mention for r in command.role_checks if r)
-            embed.description += f"**Required Roles:**\n{roles}"
+            description.append(f"**Required Roles:**\n{roles}")
+
+        embed = disnake.Embed(title=f"{command.type} Details", description="".join(description))
+        embed.set_thumbnail(url=self._get_bot_identity()[1])
+
+        if isinstance(command, SlashCommand):
+            embed.set_footer(text="[ required arguments ] | ( optional arguments )")
 
         if isinstance(command, SlashCommand):
             if command.args:
@@ -526,66 +759,63 @@ class Help(commands.Cog):
         embeds = []
         for name, command_lines in command_sections.items():
             if command_lines:
-                base_embed = self._create_base_embed(name)
+                base_payload = self._create_base_embed(name).to_dict()
                 chunked_section_content = self._chunk_section_content(command_lines)
-                embeds.extend(self._create_section_embeds(base_embed, chunked_section_content))
+                embeds.extend(self._create_section_embeds(base_payload, chunked_section_content))
         return embeds
 
     def _create_base_embed(self, section_name) -> disnake.Embed:
+        bot_name, avatar_url = self._get_bot_identity()
         base_embed = disnake.Embed(
-            title=f"{self.bot.user.display_name} Command Help - {section_name}",
+            title=f"{bot_name} Command Help - {section_name}",
             description=getattr(self.bot, "description", DESCRIPTION),
         )
-        base_embed.set_thumbnail(
-            url=self.bot.user.avatar.url
-            if self.bot.user.avatar
-            else self.bot.user.default_avatar.url
-        )
+        base_embed.set_thumbnail(url=avatar_url)
         return base_embed
 
     def _organize_commands(
         self, commands: List[Union[SlashCommand, UserCommand, MessageCommand]]
     ) -> dict:
-        command_sections = {
-            "Slash Commands": [],
-            "User Context Commands": [],
-            "Message Context Commands": [],
-        }
+        sections = {SlashCommand: [], UserCommand: [], MessageCommand: []}
 
         for command in commands:
-            command_line = f"{command.mention}\n*{command.description}*\n\n"
-            if isinstance(command, SlashCommand):
-                command_sections["Slash Commands"].append(command_line)
-            elif isinstance(command, UserCommand):
-                command_sections["User Context Commands"].append(command_line)
-            elif isinstance(command, MessageCommand):
-                command_sections["Message Context Commands"].append(command_line)
-
-        return command_sections
+            section = sections.get(type(command))
+            if section is not None:
+                section.append(f"{command.mention}\n*{command.description}*\n\n")
+
+        return {
+            "Slash Commands": sections[SlashCommand],
+            "User Context Commands": sections[UserCommand],
+            "Message Context Commands": sections[MessageCommand],
+        }
 
     def _chunk_section_content(self, command_lines: List[str]) -> List[str]:
-        section_content = "".join(command_lines)
-        section_chunks = section_content.split(EMBED_BREAK)
-
+        # each line already ends with EMBED_BREAK, which isn't counted against the limit
         chunked_section_content = []
-        temp_content = ""
-        for chunk in section_chunks:
-            if len(temp_content) + len(chunk) <= MAX_EMBED_FIELD_CHAR_COUNT:
-                temp_content += chunk + EMBED_BREAK
-            else:
-                chunked_section_content.append(temp_content)
-                temp_content = chunk + EMBED_BREAK
-        chunked_section_content.append(temp_content)
+        buffer = []
+        buffer_len = 0
+        for line in command_lines:
+            line_len = len(line) - len(EMBED_BREAK)
+            if buffer and buffer_len + line_len > MAX_EMBED_FIELD_CHAR_COUNT:
+                chunked_section_content.append("".join(buffer))
+                buffer = []
+                buffer_len = 0
+            buffer.append(line)
+            buffer_len += len(line)
+
+        if buffer:
+            chunked_section_content.append("".join(buffer))
 
         return chunked_section_content
 
     def _create_section_embeds(
-        self, base_embed: disnake.Embed, section_content: List[str]
+        self, base_payload: disnake.types.embed.Embed, section_content: List[str]
     ) -> List[disnake.Embed]:
+        # the base embed has no fields, so the embeds built from it never share a fields list
         embeds = []
         for i, content in enumerate(section_content):
             if i % MAX_EMBED_FIELDS == 0:
-                embed = copy.deepcopy(base_embed)
+                embed = disnake.Embed.from_dict(base_payload)
                 embeds.append(embed)
             embed.add_field(name=f"\u200b", value=content, inline=False)
         return embeds
@@ -609,8 +839,16 @@ class Help(commands.Cog):
         `List[str]`
             A list of matched command names.
         """
-        commands = self._walk_app_commands(inter.guild)
-        return [c.name for c in commands if string.lower() in c.name.lower()][:25]
+        needle = string.lower()
+        matches = []
+        walked = await self._get_app_commands(inter.guild)
+        for lower_name, name in walked.autocomplete_index:
+            if needle in lower_name:
+                matches.append(name)
+                if len(matches) == 25:
+                    break
+
+        return matches
 
 
 def setup(bot: commands.InteractionBot) -> None:
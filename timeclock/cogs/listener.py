@@ -1,8 +1,9 @@
-from datetime import datetime
+import time
 from typing import Union
 
 import disnake
 from disnake.ext import commands
+from disnake.utils import format_dt
 
 from timeclock import log
 from timeclock.bot import TimeClockBot
@@ -16,20 +17,35 @@ class Listeners(commands.Cog):
 
     def __init__(self, bot: TimeClockBot) -> None:
         self.bot = bot
+        self._button_handlers = {
+            "punch": self.handle_punch_button,
+            "trash": self.handle_trash_button,
+        }
 
     @commands.Cog.listener("on_button_click")
+    async def dispatch_button_click(self, inter: disnake.MessageInteraction) -> None:
+        """Route a button click to its handler by the prefix of the button's custom ID"""
+        prefix, _, _ = inter.component.custom_id.partition(":")
+        handler = self._button_handlers.get(prefix)
+
+        # trash buttons sent before the "trash:<member_id>" format used "<member_id>_trash"
+        if handler is None and prefix.endswith("_trash"):
+            handler = self.handle_trash_button
+
+        if handler is not None:
+            await handler(inter)
+
     async def handle_trash_button(self, inter: disnake.MessageInteraction) -> None:
         """Delete a message if the user has permission to do so"""
 
-        if not "trash" in inter.component.custom_id:
-            return
-
-        mod_roles = await self.bot.get_guild_roles(inter.guild.id, is_mod=True)
+        owner_id = inter.component.custom_id.removeprefix("trash:").removesuffix("_trash")
 
+        # cheapest first: the owner, then the channel permissions Discord resolved for the
+        # interaction, only then the guild's mod roles
         if (
-            not str(inter.author.id) in inter.component.custom_id
-            and not inter.channel.permissions_for(inter.author).manage_messages
-            and not any(role in mod_roles for role in inter.author.roles)
+            owner_id != str(inter.author.id)
+            and not inter.permissions.manage_messages
+            and not await self.is_mod(inter.author)
         ):
             await inter.response.send_message(
                 "You are not the person that requested this message.", ephemeral=True
@@ -39,56 +55,71 @@ class Listeners(commands.Cog):
         await inter.response.defer()
         await inter.delete_original_response()
 
-    @commands.Cog.listener("on_button_click")
-    async def punch_in_out_click(self, inter: disnake.MessageInteraction) -> None:
-        """A button click event listeners specifically listening for users that click on
-        the punch in/out button"""
+    async def handle_punch_button(self, inter: disnake.MessageInteraction) -> None:
+        """Punch the member in or out when they click on the punch in/out button"""
 
-        if inter.component.custom_id != "punch":
-            return
+        # acknowledge right away, the permission check and punch may have to hit the database
+        timestamp = time.time()
+        await inter.response.defer()
 
         allowed = await self.punch_allowed(inter.author)
 
         if not allowed:
-            return await inter.response.send_message(
+            return await inter.followup.send(
                 "You don't have a role that is allowed to punch in/out", ephemeral=True
             )
 
-        timestamp = datetime.timestamp(disnake.utils.utcnow())
         member = await self.bot.add_punch(inter.guild.id, inter.author.id, timestamp)
-        logger
 
         embed = self.create_punch_embed(inter.author, member, timestamp)
 
-        await inter.response.send_message(embed=embed, ephemeral=True, delete_after=5)
+        await inter.followup.send(embed=embed, ephemeral=True, delete_after=5)
 
     def create_punch_embed(
         self, member: disnake.Member, db_member: Member, timestamp: float
     ) -> disnake.Embed:
         embed = disnake.Embed()
-        embed.set_author(
-            name=member.display_name,
-            icon_url=member.display_avatar.url if member.display_avatar else None,
-        )
+        embed.set_author(name=member.display_name, icon_url=member.display_avatar.url)
+
+        clocked_at = format_dt(timestamp, "t")
 
         # member just clocked in
         if db_member.on_duty:
-            embed.description = f"You clocked in at {disnake.utils.format_dt(timestamp, 't')}"
+            embed.description = f"You clocked in at {clocked_at}"
 
         # member clocked out
+        elif db_member.last_punch_in is not None:
+            embed.description = (
+                f"You clocked out at {clocked_at} after clocking in "
+                f"{format_dt(db_member.last_punch_in, 'R')}"
+            )
+
         else:
-            # get most recent clock in event time
-            event = [time for time in db_member.times][-1]
-            embed.description = f"You clocked out at {disnake.utils.format_dt(timestamp, 't')} after clocking in {disnake.utils.format_dt(event.punch_in, 'R')}"
+            embed.description = f"You clocked out at {clocked_at}"
 
         return embed
 
+    async def is_mod(self, member: disnake.Member) -> bool:
+        """Check if the member has one of the guild's configured mod roles"""
+        mod_ids = await self.bot.guild_cache.get_mod_role_ids(member.guild.id)
+        return not mod_ids.isdisjoint(role.id for role in member.roles)
+
     async def punch_allowed(self, member: disnake.Member) -> bool:
-        """Check if the member is allowed to punch in or not"""
-        allowed_roles = await self.bot.get_guild_roles(member.guild.id, is_mod=True)
-        return (
-            any(role in allowed_roles for role in member.roles)
-            or member.guild_permissions.administrator
+        """Check if the member is allowed to punch in or not, anyone may punch in when the
+        guild hasn't configured any roles"""
+        if member.guild_permissions.administrator:
+            return True
+
+        guild_cache = self.bot.guild_cache
+        allowed_ids = await guild_cache.get_punch_role_ids(member.guild.id)
+        if not allowed_ids:
+            # roles configured with `can_punch=False` only leave admins able to punch
+            return not await guild_cache.get_roles(member.guild.id)
+
+        # `member.roles` builds and sorts a list of every role the member has, probe the few
+        # allowed IDs instead, @everyone is never within the member's own roles
+        return member.guild.id in allowed_ids or any(
+            member.get_role(role_id) is not None for role_id in allowed_ids
         )
 
     @commands.Cog.listener("on_raw_message_delete")
@@ -97,29 +128,30 @@ class Listeners(commands.Cog):
         self, payload: Union[disnake.RawBulkMessageDeleteEvent, disnake.RawMessageDeleteEvent]
     ) -> None:
         """If any messages are deleted that contain the configured message ID for an embed,
-        the message, channel, and embeds that have been configured are removed."""
+        the configured message and channel are forgotten, the configured embed is kept."""
 
+        if payload.guild_id is None:
+            return
+
+        # bulk deletes already carry a set, a single ID is only ever compared against once
         if isinstance(payload, disnake.RawBulkMessageDeleteEvent):
             message_ids = payload.message_ids
 
         else:
-            message_ids = [payload.message_id]
+            message_ids = (payload.message_id,)
 
-        if payload.guild_id is None:
+        # most deleted messages aren't a punch message, skip those without loading the guild
+        if not self.bot.guild_cache.may_be_config_message(payload.guild_id, message_ids):
             return
 
-        guild = await self.bot.ensure_guild(payload.guild_id)
+        guild = await self.bot.guild_cache.get_guild(payload.guild_id)
 
         if not guild or guild.message_id is None:
             return
 
-        for message_id in message_ids:
-            if message_id == guild.message_id:
-                logger.info(f"Config message `{message_id}` deleted in `{payload.guild_id}`")
-                await self.bot.guild_cache.update_guild(
-                    payload.guild_id, message_id=message_id, channel_id=None
-                )
-                break
+        if guild.message_id in message_ids:
+            logger.info(f"Config message `{guild.message_id}` deleted in `{payload.guild_id}`")
+            await self.bot.remove_config_message(payload.guild_id, guild.message_id)
 
 
 def setup(bot: TimeClockBot) -> None:
@@ -5,6 +5,7 @@ from disnake.ext import commands
 
 from timeclock import components
 from timeclock.bot import TimeClockBot
+from timeclock.constants import Cache
 from timeclock.database import Member
 
 
@@ -17,27 +18,22 @@ class TimeClock(commands.Cog):
     async def check_member_permissions(self, inter: disnake.GuildCommandInteraction) -> bool:
         """Checks if the member contains any of the mod_roles or has the administrator permissions
         for the guild"""
-        mod_roles = await self.bot.get_guild_roles(inter.guild.id, is_mod=True)
-        permissions = disnake.Permissions(manage_roles=True)
+        if inter.author.guild_permissions.manage_roles:
+            return True
 
-        return (
-            any(role in mod_roles for role in inter.author.roles)
-            or inter.author.guild_permissions >= permissions
-        )
+        mod_ids = await self.bot.guild_cache.get_mod_role_ids(inter.guild.id)
+        return not mod_ids.isdisjoint(role.id for role in inter.author.roles)
 
     def calculate_time_totals(self, seconds: float) -> str:
         """
         Returns the total total formatted as a string
         {days} days, {hours} hours, {minutes} minutes, {seconds} seconds
         """
-        days, rem = divmod(seconds, 86400)
+        days, rem = divmod(int(seconds), 86400)
         hours, rem = divmod(rem, 3600)
-        minutes, rem = divmod(rem, 60)
-        seconds, rem = divmod(rem, 60)
+        minutes, seconds = divmod(rem, 60)
 
-        return (
-            f"{int(days)} days, {int(hours)} hours, {int(minutes)} minutes, {int(seconds)} seconds"
-        )
+        return f"{days} days, {hours} hours, {minutes} minutes, {seconds} seconds"
 
     def create_all_member_timesheet_embed(
         self, guild: disnake.Guild, members: List[Member], limit: int
@@ -63,34 +59,40 @@ class TimeClock(commands.Cog):
             The list of created embeds
         """
 
+        # `guild.icon` builds a new Asset on every access, resolve the URL once for all pages
+        thumbnail_url = icon.url if (icon := guild.icon) else None
+
         def create_embed(title, description):
             embed = disnake.Embed(title=title, description=description)
-            embed.set_thumbnail(url=guild.icon.url if guild.icon else None)
+            embed.set_thumbnail(url=thumbnail_url)
             embed.set_footer(text="🟢 On Duty | 🔴 Off Duty")
             return embed
 
         total_time = 0
+        lines = []
         for member in members:
-            total_time += sum(time.as_seconds() for time in member.limit_history(limit))
+            line, seconds = member.as_string_with_total(guild, limit)
+            lines.append(f"{line}\n")
+            total_time += seconds
 
         total_time_as_string = self.calculate_time_totals(total_time)
-        descriptions = [
-            f"**Total On Duty time for the last {limit} days**\n{total_time_as_string}\n\n"
-        ]
-        current_description = descriptions[0]
-
-        for member in members:
-            line = f"{member.as_string(guild)}\n"
-            if len(current_description + line) > 1000:
-                descriptions.append(line)
-                current_description = descriptions[-1]  # Change to the last description in the list
+        header = f"**Total On Duty time for the last {limit} days**\n{total_time_as_string}\n\n"
+        pages: List[List[str]] = [[header]]
+        lengths = [len(header)]
+
+        for line in lines:
+            if lengths[-1] + len(line) > 1000:
+                pages.append([line])
+                lengths.append(len(line))
             else:
-                current_description += line
-                descriptions[-1] = current_description  # Update the last description in the list
+                pages[-1].append(line)
+                lengths[-1] += len(line)
 
         embeds = [
-            create_embed("Member Time Totals" if i == 0 else "Member Time Totals (continued)", desc)
-            for i, desc in enumerate(descriptions)
+            create_embed(
+                "Member Time Totals" if i == 0 else "Member Time Totals (continued)", "".join(page)
+            )
+            for i, page in enumerate(pages)
         ]
         return embeds
 
@@ -98,7 +100,7 @@ class TimeClock(commands.Cog):
     async def timesheet(
         self,
         inter: disnake.GuildCommandInteraction,
-        history: int = commands.Param(7, ge=1, le=31),
+        history: int = commands.Param(7, ge=1, le=Cache.history_days),
         all_members: Optional[bool] = False,
         member: Optional[disnake.Member] = None,
     ) -> None:
@@ -114,45 +116,40 @@ class TimeClock(commands.Cog):
             Specify a member to view their timesheet (Cannot be used with all_members)
 
         """
-        await inter.response.defer()
-
-        # check if member argument is being passed, check author permissions
-        if all_members or member:
-            if all_members and member:
-                await inter.delete_original_response()
-                return await inter.followup.send(
-                    "If `all_members` is set to True, you cannot include a specific member",
-                    ephemeral=True,
-                )
+        # invalid arguments and denied members are answered before deferring, with a single
+        # ephemeral response instead of a deferred one that has to be deleted again
+        if all_members and member:
+            return await inter.response.send_message(
+                "If `all_members` is set to True, you cannot include a specific member",
+                ephemeral=True,
+            )
 
-            if not await self.check_member_permissions(inter):
-                await inter.delete_original_response()
-                return await inter.followup.send(
-                    "You do not have permissions to view other member timesheets",
-                    ephemeral=True,
-                )
+        # the permission check only reads cached role IDs
+        if (all_members or member) and not await self.check_member_permissions(inter):
+            return await inter.response.send_message(
+                "You do not have permissions to view other member timesheets",
+                ephemeral=True,
+            )
 
-            if all_members:
-                all_members = await self.bot.get_members(inter.guild.id)
+        await inter.response.defer()
 
-                if not all_members:
-                    await inter.delete_original_response()
-                    return await inter.followup.send(
-                        "No members have clocked in yet!", ephemeral=True
-                    )
+        if all_members:
+            all_members = await self.bot.get_members(inter.guild.id)
 
-                embeds = self.create_all_member_timesheet_embed(inter.guild, all_members, history)
-                if len(embeds) == 1:
-                    await inter.followup.send(
-                        embed=embeds[0], components=components.TrashButton(inter.author.id)
-                    )
-                    return
+            if not all_members:
+                await inter.delete_original_response()
+                return await inter.followup.send("No members have clocked in yet!", ephemeral=True)
 
+            embeds = self.create_all_member_timesheet_embed(inter.guild, all_members, history)
+            if len(embeds) == 1:
                 await inter.followup.send(
-                    embed=embeds[0], view=components.Pagination(embeds, inter.author)
+                    embed=embeds[0], components=components.TrashButton(inter.author.id)
                 )
                 return
 
+            await inter.followup.send(embed=embeds[0], view=components.Pagination(embeds, inter))
+            return
+
         member = member or inter.author
         tc_member = await self.bot.get_members(inter.guild.id, member_id=member.id)
 
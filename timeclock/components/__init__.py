@@ -1,12 +1,10 @@
 from .buttons import TrashButton
-from .default import default_embed
 from .modal import EditEmbed
 from .views import EditEmbedButtons, Pagination
 
 __all__ = (
     "TrashButton",
-    "default_embed",
-    "EmbedEmbed",
+    "EditEmbed",
     "EditEmbedButtons",
     "Pagination",
 )
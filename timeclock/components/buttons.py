@@ -8,5 +8,5 @@ class TrashButton(disnake.ui.Button):
         super().__init__(
             emoji="🪓",
             style=disnake.ButtonStyle.gray,
-            custom_id=f"{member_id}_trash",
+            custom_id=f"trash:{member_id}",
         )
@@ -1,4 +1,5 @@
-from typing import Union
+import asyncio
+from typing import Sequence
 
 import disnake
 
@@ -12,25 +13,98 @@ logger = log.get_logger(__name__)
 
 
 class Pagination(disnake.ui.View):
-    def __init__(
-        self, embeds: list[disnake.Embed], author: Union[disnake.Member, disnake.User]
-    ) -> None:
-        super().__init__(timeout=None)
-        self.author = author
-        self.embeds = embeds
+    TIMEOUT = 300
+
+    def __init__(self, embeds: Sequence[disnake.Embed], inter: disnake.Interaction) -> None:
+        # every live view is kept by the bot, a paginator is only kept for so long after its
+        # last click
+        super().__init__(timeout=self.TIMEOUT)
+        self.author = author = inter.author
+        # the command whose original response shows the pages, then the latest click on them,
+        # its token is still valid when the view times out
+        self._inter: disnake.Interaction | None = inter
+        # the pages never change, everything derived from them is computed here once
+        self.embeds = embeds = tuple(embeds)
         self.index = 0
+        count = len(embeds)
+        self._last = count - 1
+        self._labels = tuple(f"[{i + 1}/{count}]" for i in range(count))
+        self._state_index: int | None = None
+        # whether the backward and forward buttons are disabled, adjacent pages mostly share it
+        self._edges: tuple[bool, bool] | None = None
+        self._editing = False
+        self._pending: disnake.MessageInteraction | None = None
         self.add_item(TrashButton(author.id))
 
         self._update_state()
 
     def _update_state(self) -> None:
-        self.first_page.disabled = self.prev_page.disabled = self.index == 0
-        self.last_page.disabled = self.next_page.disabled = self.index == len(self.embeds) - 1
-        self.page_num.label = f"[{self.index+1}/{len(self.embeds)}]"
-        self.page_num.disabled = True
+        # the buttons only depend on the page index
+        if (index := self.index) == self._state_index:
+            return
+
+        at_first, at_last = edges = (index == 0, index == self._last)
+        if (previous := self._edges) != edges:
+            if previous is None or previous[0] != at_first:
+                self.first_page.disabled = self.prev_page.disabled = at_first
+            if previous is None or previous[1] != at_last:
+                self.last_page.disabled = self.next_page.disabled = at_last
+            self._edges = edges
+        self.page_num.label = self._labels[index]
+        self._state_index = index
+
+    async def on_timeout(self) -> None:
+        # the view is no longer dispatched to, release the pages and buttons it holds
+        inter, self._inter = self._inter, None
+        self.embeds = ()
+        self._labels = ()
+        self._pending = None
+        self.clear_items()
+
+        # page clicks would no longer be answered, only leave the trash button on the message,
+        # the listener cog handles it by its custom ID
+        try:
+            await inter.edit_original_response(components=TrashButton(self.author.id))
+        except disnake.HTTPException:
+            # the message has been trashed since
+            pass
+
+    async def _show_page(self, inter: disnake.MessageInteraction) -> None:
+        """Show the current page in response to a click.
+
+        Clicks arriving while an edit is in flight only acknowledge the interaction, the page is
+        sent once that edit is done with the state of the latest click, so rapid clicking
+        issues a single follow-up edit instead of one edit per click."""
+        self._inter = inter
+        self._update_state()
+
+        if not self._editing:
+            self._editing = True
+            try:
+                await inter.response.edit_message(embed=self.embeds[self.index], view=self)
+                await self._flush_pending()
+            finally:
+                self._editing = False
+            return
+
+        await inter.response.defer()
+        self._pending = inter
+
+        # the edit in flight may have finished while this click was being acknowledged
+        if not self._editing:
+            self._editing = True
+            try:
+                await self._flush_pending()
+            finally:
+                self._editing = False
+
+    async def _flush_pending(self) -> None:
+        while (pending := self._pending) is not None:
+            self._pending = None
+            await pending.edit_original_response(embed=self.embeds[self.index], view=self)
 
     async def inter_check(self, inter: disnake.MessageInteraction) -> bool:
-        if "trash" in inter.component.custom_id:
+        if inter.component.custom_id.startswith("trash:"):
             return False
 
         if self.author.id == inter.author.id:
@@ -46,16 +120,12 @@ class Pagination(disnake.ui.View):
         self, button: disnake.ui.Button, inter: disnake.MessageInteraction
     ) -> None:
         self.index = 0
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.embeds[self.index], view=self)
+        await self._show_page(inter)
 
     @disnake.ui.button(label="Previous", style=disnake.ButtonStyle.secondary)
     async def prev_page(self, button: disnake.ui.Button, inter: disnake.MessageInteraction) -> None:
-        self.index -= 1
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.embeds[self.index], view=self)
+        self.index = max(self.index - 1, 0)
+        await self._show_page(inter)
 
     @disnake.ui.button(label="1", style=disnake.ButtonStyle.secondary, disabled=True)
     async def page_num(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
@@ -63,17 +133,13 @@ class Pagination(disnake.ui.View):
 
     @disnake.ui.button(label="Next", style=disnake.ButtonStyle.secondary)
     async def next_page(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
-        self.index += 1
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.embeds[self.index], view=self)
+        self.index = min(self.index + 1, self._last)
+        await self._show_page(inter)
 
     @disnake.ui.button(label="Last Page", style=disnake.ButtonStyle.primary)
     async def last_page(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
-        self.index = len(self.embeds) - 1
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.embeds[self.index], view=self)
+        self.index = self._last
+        await self._show_page(inter)
 
 
 class EditEmbedButtons(disnake.ui.View):
@@ -124,10 +190,14 @@ class EditEmbedButtons(disnake.ui.View):
     ) -> None:
         """Callback for save embed button"""
 
-        await inter.response.defer(with_message=True, ephemeral=True)
+        # acknowledge without a new message, the confirmation replaces this one when done
+        await inter.response.defer()
 
         embed = self.embed
+        guild = await self.bot.guild_cache.get_guild(inter.guild.id)
 
+        # the configured message may have been deleted while the bot was offline, editing it also
+        # checks that it's still there
         if self.message:
             try:
                 message = await self.message.edit(content=None, embed=embed)
@@ -136,18 +206,29 @@ class EditEmbedButtons(disnake.ui.View):
         else:
             message = await self.send_embed(inter.channel, embed)
 
-        await self.bot.ensure_guild(
-            inter.guild.id,
-            message_id=message.id,
-            channel_id=message.channel.id,
-            embed=embed,
-        )
-
-        await inter.edit_original_response(
+        # there is nothing to store if the guild is already configured with this message and embed
+        if guild is not None and guild.message_id == message.id and guild.embed == embed:
+            store = None
+        else:
+            store = self.bot.ensure_guild(
+                inter.guild.id,
+                message_id=message.id,
+                channel_id=message.channel.id,
+                embed=embed,
+            )
+
+        confirm = inter.edit_original_response(
             f"Your customization has been saved. You may close this message.\n[Click here]({message.jump_url}) to view!",
+            embed=None,
+            attachments=[],
             view=self.clear_items(),
         )
-        await self.inter.delete_original_response()
+
+        # both only need the posted message, store the config while the confirmation is sent
+        if store is None:
+            await confirm
+        else:
+            await asyncio.gather(store, confirm)
         logger.warning(f"{inter.author} edited the timeclock embed in {inter.guild.name}")
         self.stop()
 
@@ -1,20 +1,8 @@
 import os
 
-import disnake
+from timeclock._env import ensure_loaded
 
-from timeclock import log
-
-logger = log.get_logger(__name__)
-
-
-try:
-    import dotenv
-except ModuleNotFoundError:
-    pass
-
-else:
-    dotenv.load_dotenv(override=True)
-    logger.info(f"Environment variables loaded from .env file")
+ensure_loaded()
 
 
 class Client:
@@ -25,8 +13,17 @@ class Database:
     sql_bind = "sqlite+aiosqlite:///timeclock/database/data.sqlite3"
 
 
+class Cache:
+    max_members: int = int(os.getenv("MAX_CACHED_MEMBERS") or 10_000)
+    # the longest history a timesheet can show, older punches are never loaded
+    history_days: int = 31
+
+
 def default_embed():
     """Create and return a default embed"""
+    # only the embed config command needs disnake from here, importing the settings doesn't
+    import disnake
+
     embed = disnake.Embed(
         title="This is your embed title.",
         description=(
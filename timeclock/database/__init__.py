@@ -4,6 +4,7 @@ from .base import Base
 from .guild import Guild
 from .member import Member
 from .role import Role
+from .session import session_scope
 from .time import Time
 
 __all__ = (
@@ -12,11 +13,33 @@ __all__ = (
     "Member",
     "Role",
     "Time",
+    "create_indexes",
+    "session_scope",
 )
 
 
-async def create_database(engine: AsyncEngine, base: Base = Base) -> None:
+async def create_database(engine: AsyncEngine, base: Base = Base, *, dispose: bool = False) -> None:
+    """Drop and create every table, the engine's pooled connections are kept for the bot
+    unless `dispose` is set"""
     async with engine.begin() as conn:
         await conn.run_sync(base.metadata.drop_all)
         await conn.run_sync(base.metadata.create_all)
-    await engine.dispose()
+
+    if dispose:
+        await engine.dispose()
+
+
+async def create_indexes(engine: AsyncEngine, base: Base = Base, *, dispose: bool = False) -> None:
+    """Create any indexes missing from a previously initialized database, pooled connections
+    are kept as in `create_database`"""
+
+    def _create(conn) -> None:
+        for table in base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_create)
+
+    if dispose:
+        await engine.dispose()
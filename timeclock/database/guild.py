@@ -17,21 +17,39 @@ class Guild(Base):
     message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True, default=None)
     channel_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True, default=None)
     _embed: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
-    roles: Mapped[list[Role]] = relationship("Role", lazy="subquery")
+    # every guild is loaded for the cache, whose queries load the roles explicitly
+    roles: Mapped[list[Role]] = relationship("Role", lazy="raise")
 
     @property
     def embed(self) -> disnake.Embed | None:
         if self._embed is None:
             return
 
-        embed_dict = json.loads(self._embed)
+        # cached guilds are long-lived, decode the stored JSON once per value of the column
+        decoded = self.__dict__.get("_embed_decoded")
+        if decoded is None or decoded[0] is not self._embed:
+            decoded = self.__dict__["_embed_decoded"] = (self._embed, self.load_embed(self._embed))
+
+        # `Embed.from_dict` keeps the field dicts it's given, every read gets its own copies
+        embed_dict = decoded[1]
+        if fields := embed_dict.get("fields"):
+            embed_dict = {**embed_dict, "fields": [dict(field) for field in fields]}
+
         return disnake.Embed.from_dict(embed_dict)
 
     @embed.setter
     def embed(self, embed: disnake.Embed) -> None:
+        self._embed = self.dump_embed(embed)
+
+    @staticmethod
+    def load_embed(data: str) -> dict:
+        """Deserialize the string stored in the `_embed` column"""
+        return json.loads(data)
+
+    @staticmethod
+    def dump_embed(embed: disnake.Embed | None) -> str | None:
+        """Serialize an embed to the string stored in the `_embed` column"""
         if embed is None:
-            self._embed = None
-            return
+            return None
 
-        embed_dict = embed.to_dict()
-        self._embed = json.dumps(embed_dict)
+        return json.dumps(embed.to_dict())
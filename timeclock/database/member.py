@@ -1,4 +1,4 @@
-import datetime
+import time
 
 import disnake
 from sqlalchemy import BigInteger, Boolean, Column
@@ -7,6 +7,22 @@ from sqlalchemy.orm import Mapped, relationship
 from .base import Base
 from .time import Time
 
+# indexed by `Member.on_duty`
+_STATUS_ICONS = ("🔴", "🟢")
+
+
+def history_cutoff(days: int, now: float | None = None) -> float:
+    """Return the unix timestamp `days` days before `now` (the current time if not given)"""
+    return (time.time() if now is None else now) - days * 86400
+
+
+def _format_duration(total_seconds: float) -> str:
+    days, rem = divmod(int(total_seconds), 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, seconds = divmod(rem, 60)
+
+    return f"{days} days, {hours} hours, {minutes} minutes, {seconds} seconds"
+
 
 class Member(Base):
     """
@@ -29,7 +45,14 @@ class Member(Base):
     id: Mapped[int] = Column(BigInteger, primary_key=True)
     guild_id: Mapped[int] = Column(BigInteger, nullable=False)
     on_duty: Mapped[bool] = Column(Boolean, nullable=False, default=False)
-    times: Mapped[list[Time]] = relationship("Time", lazy="subquery")
+    # loaded explicitly, and only within the history window, see `cache.members.load_recent_times`.
+    # Oldest first, `latest_time` and the timesheets rely on the order (an index scan of
+    # `time_member_punch_in`), new punches are appended in order.
+    times: Mapped[list[Time]] = relationship("Time", lazy="raise", order_by=Time.punch_in)
+
+    # not stored, set by each punch to when the punch it opened or closed started, so the punch
+    # reply doesn't need to read the member's history
+    last_punch_in = None
 
     @property
     def status(self) -> str:
@@ -42,44 +65,42 @@ class Member(Base):
         """
         return "🟢 - On Duty" if self.on_duty else "🔴 - Off Duty"
 
-    def limit_history(self, limit: int = 7) -> list[Time]:
-        """Return a list of Time instances from the last {limit} days.
-
-        Parameters
-        ----------
-        limit : int, optional
-            Number of days to consider, by default 7.
+    @property
+    def latest_time(self) -> Time | None:
+        """Return the member's most recent punch.
 
         Returns
         -------
-        List['Time']
-            List of Time instances.
+        Time | None
+            The most recent Time instance, None if the member has never punched in.
         """
-        limit_date = datetime.datetime.now() - datetime.timedelta(days=limit)
-        return [
-            time
-            for time in self.times
-            if datetime.datetime.fromtimestamp(time.punch_in) >= limit_date
-        ]
+        return self.times[-1] if self.times else None
 
-    def as_string(self, guild: disnake.Guild) -> str:
-        """Return a string representation of the member and their on-duty status.
+    def as_string_with_total(self, guild: disnake.Guild, limit: int = 7) -> tuple[str, float]:
+        """Return the member's status line along with the seconds it totals, from a single
+        pass over the member's history.
 
         Parameters
         ----------
         guild : disnake.Guild
             Guild to which the member belongs.
+        limit : int, optional
+            Number of days to consider for time calculation, by default 7.
 
         Returns
         -------
-        str
-            String representation of member status.
+        tuple[str, float]
+            String representation of member status and the total clocked in seconds.
         """
-        status = "🟢" if self.on_duty else "🔴"
-        return f"{status} {guild.get_member(self.id).display_name} - {self.calculate_total_time()}"
+        total_seconds = self.total_seconds(limit)
+        # members who have left the guild are no longer cached by disnake, mention them instead
+        member = guild.get_member(self.id)
+        name = member.display_name if member is not None else f"<@{self.id}>"
+        line = f"{_STATUS_ICONS[self.on_duty]} {name} - {_format_duration(total_seconds)}"
+        return line, total_seconds
 
-    def calculate_total_time(self, limit: int = 7) -> str:
-        """Calculate and return a string of the total clocked in time over the past {limit} days.
+    def total_seconds(self, limit: int = 7) -> float:
+        """Return the total clocked in seconds over the past {limit} days.
 
         Parameters
         ----------
@@ -88,21 +109,13 @@ class Member(Base):
 
         Returns
         -------
-        str
-            Formatted string indicating total clocked in time.
+        float
+            Total clocked in seconds.
         """
-        total_seconds = sum(
-            time.as_seconds() for time in self.limit_history(limit) if time.punch_in is not None
-        )
-
-        days, rem = divmod(total_seconds, 86400)
-        hours, rem = divmod(rem, 3600)
-        minutes, rem = divmod(rem, 60)
-        seconds, rem = divmod(rem, 60)
-
-        return (
-            f"{int(days)} days, {int(hours)} hours, {int(minutes)} minutes, {int(seconds)} seconds"
-        )
+        # compare and subtract the raw timestamps, no datetimes are built per punch
+        now = time.time()
+        cutoff = history_cutoff(limit, now)
+        return sum(punch.duration_seconds(now) for punch in self.times if punch.punch_in >= cutoff)
 
     def create_timesheet_embed(self, name: str, history: int = 7) -> disnake.Embed:
         """Create and return a disnake.Embed instance for the member's times.
@@ -119,8 +132,18 @@ class Member(Base):
         disnake.Embed
             Embed containing the member's times.
         """
-        total = self.calculate_total_time(history)
-        timesheet = "\n".join(time.as_string() for time in self.limit_history(history))
+        # the total and the lines are built in the same pass over the member's times
+        now = time.time()
+        cutoff = history_cutoff(history, now)
+        total_seconds = 0.0
+        lines = []
+        for punch in self.times:
+            if punch.punch_in >= cutoff:
+                total_seconds += punch.duration_seconds(now)
+                lines.append(punch.as_string(now))
+
+        total = _format_duration(total_seconds)
+        timesheet = "\n".join(lines)
 
         embed = disnake.Embed(
             title=f"Timesheet for {name}",
@@ -1,7 +1,7 @@
 from typing import Self
 
 import disnake
-from sqlalchemy import BigInteger, Boolean, ForeignKey
+from sqlalchemy import BigInteger, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -15,5 +15,17 @@ class Role(Base):
     is_mod: Mapped[bool] = mapped_column(Boolean, nullable=False)
     can_punch: Mapped[bool] = mapped_column(Boolean, nullable=False)
 
+    __table_args__ = (
+        # a guild's roles, loaded along with the guild whenever it's cached
+        Index("role_guild", guild_id),
+    )
+
     def __eq__(self, other: Self | disnake.Role) -> bool:
+        if not isinstance(other, (Role, disnake.Role)):
+            return NotImplemented
         return other.id == self.id
+
+    # defining `__eq__` drops the inherited hash, hash like `disnake.Role` so that configured
+    # roles can be looked up by the member's roles in a set
+    def __hash__(self) -> int:
+        return self.id >> 22
@@ -0,0 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+__all__ = ("session_scope",)
+
+# the enclosing scope's session and the task that opened it, tasks created within a scope copy
+# the context but must not share its session
+_session_ctx: ContextVar[tuple[AsyncSession, asyncio.Task | None] | None] = ContextVar(
+    "_session", default=None
+)
+
+
+@asynccontextmanager
+async def session_scope(
+    factory: async_sessionmaker[AsyncSession],
+    session: AsyncSession | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """Yield the session for the current unit of work.
+
+    Database helpers awaited within the block share this session and its transaction,
+    which is committed once the outermost scope exits. A new session is only created from
+    `factory` when neither `session` nor an enclosing scope provides one."""
+    joined = None
+    if session is not None:
+        if session.in_transaction():
+            joined = session
+    elif (scope := _session_ctx.get()) is not None and scope[1] is asyncio.current_task():
+        joined = scope[0]
+
+    if joined is not None:
+        yield joined
+        return
+
+    owned = session is None
+    session = session or factory()
+    token = _session_ctx.set((session, asyncio.current_task()))
+    try:
+        async with session.begin():
+            yield session
+    finally:
+        _session_ctx.reset(token)
+        if owned:
+            await session.close()
@@ -1,8 +1,8 @@
-import datetime
-from typing import TYPE_CHECKING, Optional, Tuple
+import time
+from typing import TYPE_CHECKING, Optional
 
 import disnake
-from sqlalchemy import BigInteger, Float, ForeignKey, Integer
+from sqlalchemy import BigInteger, Float, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -16,36 +16,31 @@ class Time(Base):
     punch_in: Mapped[float] = mapped_column(Float, nullable=False)
     punch_out: Mapped[Optional[float]] = mapped_column(Float, nullable=True, default=None)
 
-    def _as_datetime(self) -> Tuple[datetime.datetime, datetime.datetime]:
-        """Converts `self.punch_in` and `self.punch_out` to datetime objects.
-        If `self.punch_out` is None, `datetime.datetime.now()` is used"""
-        punch_in = datetime.datetime.fromtimestamp(self.punch_in)
-        if self.punch_out is None:
-            punch_out = datetime.datetime.now()
-        else:
-            punch_out = datetime.datetime.fromtimestamp(self.punch_out)
-
-        return (punch_in, punch_out)
+    __table_args__ = (
+        # partial index over open punches, used to close the member's current punch
+        Index("time_open", member_id, sqlite_where=punch_out.is_(None)),
+        # a member's punches within the loaded history window
+        Index("time_member_punch_in", member_id, punch_in),
+    )
 
-    def _get_diff(self) -> str:
-        seconds = self.as_seconds()
+    def _get_diff(self, now: float) -> str:
+        hours, rem = divmod(int(self.duration_seconds(now)), 3600)
+        minutes, seconds = divmod(rem, 60)
 
-        hours, rem = divmod(seconds, 3600)
-        minutes, rem = divmod(rem, 60)
-        seconds, rem = divmod(rem, 60)
+        return f"{hours} hours, {minutes} minutes, {seconds} seconds"
 
-        return f"{int(hours)} hours, {int(minutes)} minutes, {int(seconds)} seconds"
-
-    def as_seconds(self) -> float:
+    def duration_seconds(self, now: float) -> float:
         """
         Returns difference between punch_out and punch_in as seconds.
-        If punch out is None (member is still punched in) uses `datetime.datetime.now()`
-        instead
+        If punch out is None (member is still punched in) uses `now` instead
         """
-        punch_in, punch_out = self._as_datetime()
-        return (punch_out - punch_in).total_seconds()
+        return (self.punch_out if self.punch_out is not None else now) - self.punch_in
 
-    def as_string(self) -> str:
+    def as_string(self, now: Optional[float] = None) -> str:
+        """
+        Returns the punch as a timesheet line, an open punch's total runs until `now`
+        (the current time if not given)
+        """
         if self.punch_out is None:
             _out = "-"
         else:
@@ -53,6 +48,6 @@ class Time(Base):
 
         _in = disnake.utils.format_dt(self.punch_in, "t")
 
-        diff = self._get_diff()
+        diff = self._get_diff(time.time() if now is None else now)
 
         return f"In: {_in} | Out: {_out} | Total: {diff}"
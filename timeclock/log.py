@@ -6,12 +6,14 @@ import coloredlogs
 
 
 class IgnoreSpecificMessage(logging.Filter):
+    # every ignored warning is matched by how it starts, in a single `str.startswith` call
+    warnings_to_ignore = (
+        "PyNaCl is not installed, voice will NOT be supported",
+        "Applied processor reduces input query to empty string, all comparisons will have score 0.",
+    )
+
     def filter(self, record) -> bool:
-        warnings_to_ignore = (
-            "PyNaCl is not installed, voice will NOT be supported",
-            "Applied processor reduces input query to empty string, all comparisons will have score 0. [Query: '']",
-        )
-        return not any(warning in record.getMessage() for warning in warnings_to_ignore)
+        return not record.getMessage().startswith(self.warnings_to_ignore)
 
 
 # setup logging format